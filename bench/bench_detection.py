@@ -0,0 +1,40 @@
+"""Benchmark deteksi per pair (`find_signals`) dengan data snapshot sintetis.
+
+Jalankan dari root repo: python -m bench.bench_detection [jumlah_pair] [snapshot_per_pair]
+"""
+import sys
+import time
+import numpy as np
+import pandas as pd
+from datetime import datetime, timedelta
+from dexscreener.detection import find_signals, DEFAULT_THRESHOLDS
+
+
+def make_snapshots(pairs, depth, seed=42):
+    """Membuat `pairs` x `depth` snapshot acak dengan urutan baris tercampur seperti hasil query."""
+    rng = np.random.default_rng(seed)
+    now = datetime.now()
+    n = pairs * depth
+    df = pd.DataFrame({
+        "pair_address": np.repeat([f"pair{i}" for i in range(pairs)], depth),
+        "created_at": np.tile([now - timedelta(minutes=depth - j) for j in range(depth)], pairs),
+        "priceChange24h": rng.normal(0, 60, n),
+        "volume24h": rng.lognormal(10, 2, n),
+        "liquidityUsd": rng.lognormal(9, 2, n),
+    })
+    return df.sample(frac=1, random_state=seed, ignore_index=True)
+
+
+if __name__ == "__main__":
+    pairs = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    depth = int(sys.argv[2]) if len(sys.argv) > 2 else 6
+    df = make_snapshots(pairs, depth)
+
+    timings = []
+    for _ in range(5):
+        start = time.perf_counter()
+        signals = find_signals(df, DEFAULT_THRESHOLDS)
+        timings.append(time.perf_counter() - start)
+
+    counts = {name: len(rows) for name, rows in signals.items()}
+    print(f"{len(df)} rows, {pairs} pairs: best {min(timings) * 1000:.1f} ms, median {sorted(timings)[2] * 1000:.1f} ms {counts}")
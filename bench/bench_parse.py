@@ -0,0 +1,75 @@
+"""Benchmark tahap parse: dict per pair (`parse_token_details`) vs `PairSnapshot` dengan satu timestamp per siklus.
+
+Jalankan dari root repo: python -m bench.bench_parse [jumlah_pair]
+Tidak butuh database; modul dexscreener hanya dipakai untuk fungsi parse-nya.
+"""
+import sys
+import json
+import time
+import tracemalloc
+from datetime import datetime
+from utils.json_codec import loads, orjson
+from dexscreener.snapshot import PairSnapshot
+
+
+def make_payload(pairs):
+    with open("test/api_response_2.json", encoding="utf-8") as f:
+        template = json.load(f)["pairs"][0]
+    payload = {"pairs": []}
+    for i in range(pairs):
+        pair = dict(template, pairAddress=f"pair{i}", priceUsd=str(0.0001 * (i + 1)))
+        payload["pairs"].append(pair)
+    return json.dumps(payload).encode()
+
+
+def parse_as_dicts(pairs):
+    """Salinan cara parse lama: dict 13 key dan datetime.now() per baris."""
+    rows = []
+    for token in pairs:
+        rows.append({
+            "chain_id": token.get("chainId", ""),
+            "dex_id": token.get("dexId", ""),
+            "url": token.get("url", ""),
+            "pair_address": token.get("pairAddress", ""),
+            "token_address": token.get("baseToken", {}).get("address", "-"),
+            "name": token.get("baseToken", {}).get("name", "-"),
+            "symbol": token.get("baseToken", {}).get("symbol", "-"),
+            "priceUsd": float(token.get("priceUsd", 0)),
+            "liquidityUsd": float(token.get("liquidity", {}).get("usd", 0)),
+            "volume24h": float(token.get("volume", {}).get("h24", 0)),
+            "priceChange24h": float(token.get("priceChange", {}).get("h24", 0)),
+            "market_cap": float(token.get("marketCap", 0)),
+            "created_at": datetime.now(),
+        })
+    return rows
+
+
+def parse_as_snapshots(pairs):
+    created_at = datetime.now()
+    return [PairSnapshot.from_pair(pair, created_at) for pair in pairs]
+
+
+def measure(name, func, *args, repeat=3):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+    elapsed = min(timings)
+    tracemalloc.start()
+    result = func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    print(f"{name:<24} {elapsed * 1000:8.1f} ms  peak {peak / 1024 / 1024:7.1f} MiB")
+
+
+if __name__ == "__main__":
+    pairs = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    raw = make_payload(pairs)
+    print(f"{pairs} pairs, {len(raw) / 1024 / 1024:.1f} MiB JSON, orjson {'on' if orjson else 'off'}")
+    measure("decode json.loads", json.loads, raw)
+    measure("decode utils.json_codec", loads, raw)
+    decoded = loads(raw)["pairs"]
+    measure("parse dict per pair", parse_as_dicts, decoded)
+    measure("parse PairSnapshot", parse_as_snapshots, decoded)
@@ -0,0 +1,243 @@
+"""Benchmark pipeline end-to-end dengan pasar sintetis, SQLite lokal dan HTTP yang di-stub.
+
+Tahap yang diukur per skala: save_tokens, fetch detail (decode + split batch), parse, simpan
+TokenDetail, analyze_market (sumber memory dan db) dan watch_binance. Setiap skala berjalan di
+proses terpisah supaya singleton (known_tokens, ring buffer, cache) dan database mulai kosong.
+
+Jalankan dari root repo:
+    python -m bench.bench_pipeline --tokens 1000,10000,100000
+    python -m bench.bench_pipeline --tokens 1000 --compare bench/results/pipeline-abc1234-....json
+    python -m bench.bench_pipeline --database-url sqlite:////tmp/bench.db   # SQLite file (WAL, pragma tuning)
+
+Hasil disimpan sebagai JSON di bench/results/ (atau --output) supaya regresi antar commit terlihat.
+"""
+import os
+import io
+import sys
+import json
+import time
+import platform
+import argparse
+import tempfile
+import contextlib
+import subprocess
+from datetime import datetime, timedelta
+
+RESULTS_DIR = os.path.join("bench", "results")
+
+
+class StubResponse:
+    def __init__(self, url, body):
+        self.url = url
+        self.status_code = 200
+        self.content = json.dumps(body).encode()
+
+    @property
+    def text(self):
+        return self.content.decode()
+
+
+def _timed(func, *args, **kwargs):
+    output = io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(output):
+        result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def run_scale(tokens, cycles, pairs_per_token, symbols, database_url="sqlite://"):
+    """Menjalankan semua tahap untuk satu skala di proses ini. Mengembalikan {tahap: hasil}."""
+    if database_url.startswith("sqlite:///") and database_url != "sqlite:///:memory:":
+        # File SQLite benchmark selalu dimulai kosong
+        path = database_url[len("sqlite:///"):]
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+    # Harus sebelum modul repo di-import: database lokal dan cache detail nonaktif agar tiap siklus benar-benar decode
+    os.environ["DATABASE_URL"] = database_url
+    os.environ["DEX_CACHE_TTL"] = "0"
+    os.environ["DEX_RECORD_PATH"] = ""
+
+    from bench.synthetic import SyntheticMarket, binance_tickers
+    from utils.db import session
+    import dexscreener.dex_watching as dex_watching
+    from dexscreener.dex_watching import (
+        DEX_API_URL, save_tokens, save_token_details, save_token_details_bulk,
+        fetch_token_details_batch, parse_token_details, parse_pair_snapshot, analyze_market
+    )
+    from dexscreener.ring_buffer import snapshot_buffer
+    from dexscreener.alert_state import AlertStateStore
+    import binance.main as binance_main
+    from binance.models import BncAlert
+
+    market = SyntheticMarket(tokens, pairs_per_token)
+    pairs_by_token = {}
+
+    def dex_http_get(url, **kwargs):
+        if url.startswith(DEX_API_URL):
+            addresses = url[len(DEX_API_URL):].split(",")
+            pairs = [pair for address in addresses for pair in pairs_by_token.get(address, [])]
+            return StubResponse(url, {"schemaVersion": "1.0.0", "pairs": pairs})
+        return StubResponse(url, market.profiles())
+
+    tickers = binance_tickers(symbols)
+    sent = []
+    dex_watching.http_get = dex_http_get
+    binance_main.http_get = lambda url, **kwargs: StubResponse(url, tickers)
+    binance_main.send_telegram_message = lambda message, *args, **kwargs: sent.append(kwargs.get("kind"))
+
+    results = {}
+
+    def record(stage, seconds, items):
+        entry = results.setdefault(stage, {"seconds": 0.0, "items": 0, "runs": 0})
+        entry["seconds"] += seconds
+        entry["items"] += items
+        entry["runs"] += 1
+
+    profiles = market.profiles()
+    (new_tokens, _), seconds = _timed(save_tokens, profiles)
+    record("save_tokens", seconds, len(new_tokens))
+    _, seconds = _timed(save_tokens, profiles)
+    record("save_tokens_known", seconds, len(profiles))
+
+    token_list = [(token["address"], token["chain_id"]) for token in market.tokens]
+    states = {"memory": AlertStateStore(persist=False), "db": AlertStateStore(persist=False)}
+    alerts = {"memory": 0, "db": 0}
+    started_at = datetime.now() - timedelta(minutes=cycles)
+
+    for cycle in range(cycles):
+        market.step()
+        pairs_by_token = market.details_by_token()
+        cycle_time = started_at + timedelta(minutes=cycle)
+
+        details, seconds = _timed(fetch_token_details_batch, token_list)
+        record("fetch_details", seconds, len(details))
+
+        pairs = [pair for token_details in details.values() for pair in token_details["pairs"]]
+        rows, seconds = _timed(lambda: [parse_pair_snapshot(pair, cycle_time) for pair in pairs])
+        record("parse_pair_snapshot", seconds, len(rows))
+        if cycle == 0:
+            legacy, seconds = _timed(lambda: [parse_token_details(pair) for pair in pairs])
+            record("parse_token_details", seconds, len(legacy))
+            sample = [dict(row, created_at=cycle_time - timedelta(days=1)) for row in legacy[:1000]]
+            _, seconds = _timed(lambda: [save_token_details(row) for row in sample])
+            record("save_token_details", seconds, len(sample))
+
+        saved, seconds = _timed(save_token_details_bulk, rows)
+        record("save_token_details_bulk", seconds, saved)
+        _, seconds = _timed(snapshot_buffer.append, rows)
+        record("ring_buffer_append", seconds, len(rows))
+
+        for source, state in states.items():
+            def collect(message, disable_web_page_preview=False, kind=None, source=source):
+                alerts[source] += 1
+            _, seconds = _timed(analyze_market, source=source, now=cycle_time, state=state, send=collect)
+            record(f"analyze_market_{source}", seconds, len(rows))
+
+    # Level harga untuk 1% symbol supaya trigger engine ikut bekerja
+    for ticker in tickers[::100]:
+        last = float(ticker["lastPrice"])
+        session.add(BncAlert(symbol=ticker["symbol"], higher=last * 1.01, lower=last * 0.99, watch=True))
+    session.commit()
+    session.close()
+    _, seconds = _timed(binance_main.watch_binance)
+    record("watch_binance_first", seconds, len(tickers))
+    for _ in range(3):
+        _, seconds = _timed(binance_main.watch_binance)
+        record("watch_binance", seconds, len(tickers))
+
+    for entry in results.values():
+        entry["per_second"] = round(entry["items"] / entry["seconds"], 1) if entry["seconds"] else None
+        entry["seconds_per_run"] = round(entry["seconds"] / entry["runs"], 6)
+        entry["seconds"] = round(entry["seconds"], 6)
+    results["_alerts"] = {"dex_memory": alerts["memory"], "dex_db": alerts["db"], "binance": len(sent)}
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run_suite(scales, cycles, pairs_per_token, symbols=None, database_url="sqlite://"):
+    report = {
+        "commit": git_commit(),
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cycles": cycles,
+        "pairs_per_token": pairs_per_token,
+        "symbols": symbols,
+        "database_url": database_url,
+        "scales": {},
+    }
+    for tokens in scales:
+        with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as f:
+            child_output = f.name
+        try:
+            subprocess.run(
+                [sys.executable, "-m", "bench.bench_pipeline", "--child", str(tokens),
+                 "--child-output", child_output, "--cycles", str(cycles), "--pairs-per-token", str(pairs_per_token),
+                 "--symbols", str(symbols or tokens), "--database-url", database_url],
+                check=True
+            )
+            with open(child_output, encoding="utf-8") as f:
+                report["scales"][str(tokens)] = json.load(f)
+        finally:
+            os.remove(child_output)
+        print_scale(tokens, report["scales"][str(tokens)])
+    return report
+
+
+def print_scale(tokens, results, baseline=None):
+    print(f"\n{tokens} tokens")
+    for stage, entry in results.items():
+        if stage.startswith("_"):
+            print(f"  alerts: {entry}")
+            continue
+        line = f"  {stage:<26} {entry['seconds_per_run'] * 1000:>10.1f} ms/run {entry['per_second'] or 0:>12,.0f} items/s"
+        previous = (baseline or {}).get(stage)
+        if previous and previous.get("seconds_per_run"):
+            line += f"  x{entry['seconds_per_run'] / previous['seconds_per_run']:.2f} vs baseline"
+        print(line)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tokens", default="1000,10000", help="daftar skala jumlah token, dipisah koma")
+    parser.add_argument("--cycles", type=int, default=3, help="siklus detail per skala")
+    parser.add_argument("--pairs-per-token", type=int, default=1)
+    parser.add_argument("--symbols", type=int, help="jumlah ticker Binance (default sama dengan jumlah token)")
+    parser.add_argument("--database-url", default="sqlite://", help="database SQLite yang diukur (default in-memory)")
+    parser.add_argument("--output", help="file JSON hasil (default bench/results/pipeline-<commit>-<waktu>.json)")
+    parser.add_argument("--compare", help="file JSON hasil sebelumnya sebagai pembanding")
+    parser.add_argument("--child", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--child-output", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        results = run_scale(args.child, args.cycles, args.pairs_per_token, args.symbols or args.child, args.database_url)
+        with open(args.child_output, "w", encoding="utf-8") as f:
+            json.dump(results, f)
+        sys.exit(0)
+
+    report = run_suite([int(value) for value in args.tokens.split(",")], args.cycles, args.pairs_per_token, args.symbols,
+                       args.database_url)
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"pipeline-{report['commit']}-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nSaved {output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        print(f"\nCompared with {baseline['commit']} ({baseline['created_at']})")
+        for tokens, results in report["scales"].items():
+            print_scale(tokens, results, baseline["scales"].get(tokens))
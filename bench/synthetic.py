@@ -0,0 +1,150 @@
+"""Generator pasar sintetis: profil token dan pair Dexscreener serta ticker 24 jam Binance.
+
+Bentuk payload mengikuti response asli (lihat test/api_response_1.json dan test/api_response_2.json),
+dengan nilai acak yang deterministik per seed supaya hasil benchmark antar commit bisa dibandingkan.
+"""
+import random
+
+CHAINS = [("solana", 0.55, "raydium"), ("ethereum", 0.2, "uniswap"), ("base", 0.15, "aerodrome"), ("bsc", 0.1, "pancakeswap")]
+QUOTE_TOKENS = {
+    "solana": ("So11111111111111111111111111111111111111112", "Wrapped SOL", "SOL"),
+    "ethereum": ("0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2", "Wrapped Ether", "WETH"),
+    "base": ("0x4200000000000000000000000000000000000006", "Wrapped Ether", "WETH"),
+    "bsc": ("0xbb4CdB9CBd36B01bD1cBaEBF2De08d9173bc095c", "Wrapped BNB", "WBNB"),
+}
+BASE58 = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+
+
+class SyntheticMarket:
+    """Pasar sintetis berisi `tokens` token, masing-masing dengan `pairs_per_token` pair.
+
+    Setiap panggilan `step` menggerakkan harga, volume dan likuiditas semua pair satu siklus;
+    sebagian kecil pair dibuat pump, rug pull atau volume spike agar deteksi punya hasil.
+    """
+
+    def __init__(self, tokens, pairs_per_token=1, seed=42):
+        self.rng = random.Random(seed)
+        self.tokens = [self._make_token(i) for i in range(tokens)]
+        self.pairs = []
+        for token in self.tokens:
+            for j in range(pairs_per_token):
+                self.pairs.append(self._make_pair(token, j))
+
+    def _address(self, chain_id):
+        if chain_id == "solana":
+            return "".join(self.rng.choice(BASE58) for _ in range(44))
+        return "0x" + "".join(self.rng.choice("0123456789abcdefABCDEF") for _ in range(40))
+
+    def _make_token(self, i):
+        roll = self.rng.random()
+        for chain_id, share, dex_id in CHAINS:
+            roll -= share
+            if roll <= 0:
+                break
+        address = self._address(chain_id)
+        return {
+            "chain_id": chain_id, "dex_id": dex_id, "address": address,
+            "name": f"Synthetic Token {i}", "symbol": f"SYN{i}",
+        }
+
+    def _make_pair(self, token, j):
+        chain_id = token["chain_id"]
+        pair_address = self._address(chain_id)
+        return {
+            "token": token,
+            "address": pair_address,
+            "url": f"https://dexscreener.com/{chain_id}/{pair_address.lower()}",
+            "price": 10 ** self.rng.uniform(-8, 1),
+            "liquidity": 10 ** self.rng.uniform(3, 7),
+            "volume": 10 ** self.rng.uniform(3, 7),
+            "change": self.rng.gauss(0, 40),
+            "created_ms": 1739595740000 - self.rng.randrange(0, 86400000 * 30),
+        }
+
+    def step(self):
+        """Menggerakkan pasar satu siklus."""
+        for pair in self.pairs:
+            roll = self.rng.random()
+            if roll < 0.002:  # Pump
+                pair["change"] = self.rng.uniform(120, 2000)
+                pair["volume"] *= self.rng.uniform(2, 20)
+            elif roll < 0.003:  # Rug pull
+                pair["change"] = self.rng.uniform(-99, -91)
+                pair["liquidity"] = self.rng.uniform(10, 4000)
+            elif roll < 0.006:  # Volume spike
+                pair["volume"] *= self.rng.uniform(6, 30)
+            else:
+                pair["change"] += self.rng.gauss(0, 2)
+                pair["volume"] *= self.rng.uniform(0.98, 1.05)
+            pair["price"] *= 1 + self.rng.gauss(0, 0.01)
+
+    def profiles(self):
+        """Payload endpoint token-profiles/latest/v1."""
+        return [
+            {
+                "url": f"https://dexscreener.com/{token['chain_id']}/{token['address'].lower()}",
+                "chainId": token["chain_id"],
+                "tokenAddress": token["address"],
+                "icon": f"https://dd.dexscreener.com/ds-data/tokens/{token['chain_id']}/{token['address']}.png",
+                "description": f"{token['name']} on {token['chain_id']}",
+                "links": [{"type": "twitter", "url": f"https://x.com/{token['symbol'].lower()}"}],
+            }
+            for token in self.tokens
+        ]
+
+    def pair_payload(self, pair):
+        token = pair["token"]
+        quote_address, quote_name, quote_symbol = QUOTE_TOKENS[token["chain_id"]]
+        market_cap = round(pair["price"] * 1e9, 2)
+        return {
+            "chainId": token["chain_id"],
+            "dexId": token["dex_id"],
+            "url": pair["url"],
+            "pairAddress": pair["address"],
+            "baseToken": {"address": token["address"], "name": token["name"], "symbol": token["symbol"]},
+            "quoteToken": {"address": quote_address, "name": quote_name, "symbol": quote_symbol},
+            "priceNative": f"{pair['price'] / 150:.10g}",
+            "priceUsd": f"{pair['price']:.10g}",
+            "txns": {"h24": {"buys": self.rng.randrange(5000), "sells": self.rng.randrange(5000)}},
+            "volume": {"h24": round(pair["volume"], 2), "h1": round(pair["volume"] / 24, 2)},
+            "priceChange": {"h1": round(pair["change"] / 24, 2), "h24": round(pair["change"], 2)},
+            "liquidity": {"usd": round(pair["liquidity"], 2)},
+            "fdv": market_cap,
+            "marketCap": market_cap,
+            "pairCreatedAt": pair["created_ms"],
+        }
+
+    def details(self, addresses):
+        """Payload endpoint latest/dex/tokens untuk beberapa alamat (dipisah koma)."""
+        wanted = set(addresses)
+        return {
+            "schemaVersion": "1.0.0",
+            "pairs": [self.pair_payload(pair) for pair in self.pairs if pair["token"]["address"] in wanted],
+        }
+
+    def details_by_token(self):
+        """Indeks alamat token -> payload pair, untuk stub HTTP yang harus menjawab banyak batch."""
+        index = {}
+        for pair in self.pairs:
+            index.setdefault(pair["token"]["address"], []).append(self.pair_payload(pair))
+        return index
+
+
+def binance_tickers(symbols, seed=42):
+    """Payload endpoint api/v3/ticker/24hr dengan `symbols` ticker; sekitar 1% naik lebih dari 30%."""
+    rng = random.Random(seed)
+    tickers = []
+    for i in range(symbols):
+        last = 10 ** rng.uniform(-4, 4)
+        change = rng.uniform(31, 80) if rng.random() < 0.01 else rng.gauss(0, 5)
+        tickers.append({
+            "symbol": f"SYN{i}USDT",
+            "priceChange": f"{last * change / 100:.8f}",
+            "priceChangePercent": f"{change:.3f}",
+            "lastPrice": f"{last:.8f}",
+            "highPrice": f"{last * 1.05:.8f}",
+            "lowPrice": f"{last * 0.9:.8f}",
+            "volume": f"{rng.uniform(1e3, 1e8):.2f}",
+            "count": rng.randrange(100, 100000),
+        })
+    return tickers
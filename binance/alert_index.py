@@ -0,0 +1,79 @@
+import os
+import time
+from dotenv import load_dotenv
+from utils.db import session
+from binance.models import BncAlert, BncPriceLevel
+from binance.triggers import PriceLevel, trigger_engine
+
+load_dotenv()
+
+BNC_ALERT_TTL = int(os.getenv("BNC_ALERT_TTL", 300))  # Detik sebelum indeks dibaca ulang dari database
+
+
+class BncAlertIndex:
+    """Memuat level harga `trigger_engine` dari bnc_alerts dan bnc_price_levels (hanya yang `watch` true).
+
+    Dibaca ulang dari database setelah TTL habis atau setelah `invalidate` dipanggil,
+    sehingga loop ticker tidak perlu query per symbol.
+    """
+
+    def __init__(self, ttl=BNC_ALERT_TTL):
+        self.ttl = ttl
+        self._loaded_at = None
+
+    def refresh(self):
+        try:
+            alerts = session.query(BncAlert).filter(BncAlert.watch.is_(True)).all()
+            price_levels = session.query(BncPriceLevel).filter(BncPriceLevel.watch.is_(True)).all()
+            levels = [
+                (record.symbol, PriceLevel(record.price, record.direction or "both", record.note or "level"))
+                for record in price_levels
+            ]
+            for record in alerts:
+                if record.higher is not None:
+                    levels.append((record.symbol, PriceLevel(record.higher, "up", "higher")))
+                if record.lower is not None:
+                    levels.append((record.symbol, PriceLevel(record.lower, "down", "lower")))
+        finally:
+            session.close()
+
+        trigger_engine.load(levels)
+        self._loaded_at = time.monotonic()
+
+    def ensure_fresh(self):
+        """Membaca ulang level jika belum pernah dimuat, di-invalidate, atau TTL sudah habis."""
+        loaded_at = self._loaded_at
+        if loaded_at is None or time.monotonic() - loaded_at > self.ttl:
+            self.refresh()
+
+    def invalidate(self):
+        self._loaded_at = None
+
+
+bnc_alert_index = BncAlertIndex()
+
+
+def set_bnc_alert(symbol, higher, lower, watch=True):
+    """Menyimpan atau mengubah alert harga untuk `symbol` lalu meminta indeks dibaca ulang."""
+    try:
+        session.merge(BncAlert(symbol=symbol, higher=higher, lower=lower, watch=watch))
+        session.commit()
+    except Exception as e:
+        session.rollback()
+        print(f"Save BncAlert Error: {e}")
+    finally:
+        session.close()
+    bnc_alert_index.invalidate()
+
+
+def add_price_level(symbol, price, direction="both", note=None):
+    """Menambah level harga untuk `symbol` lalu meminta indeks dibaca ulang."""
+    try:
+        session.add(BncPriceLevel(symbol=symbol, price=price, direction=direction, note=note, watch=True))
+        session.commit()
+    except Exception as e:
+        session.rollback()
+        print(f"Save BncPriceLevel Error: {e}")
+    finally:
+        session.close()
+    bnc_alert_index.invalidate()
@@ -0,0 +1,83 @@
+"""Server websocket lokal yang meniru stream `!miniTicker@arr` Binance untuk pengujian offline.
+
+Contoh:
+    python -m binance.fake_stream --port 8765 --drop-after 30
+    BNC_STREAM_URL=ws://localhost:8765 python -m binance.stream
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+
+try:
+    import websockets
+except ImportError:
+    websockets = None
+
+
+def make_symbols(count):
+    base = ["BTC", "ETH", "BNB", "SOL", "XRP", "DOGE", "ADA", "PEPE"]
+    symbols = [f"{name}USDT" for name in base]
+    symbols += [f"TKN{i}USDT" for i in range(max(0, count - len(symbols)))]
+    return symbols[:count]
+
+
+class FakeMarket:
+    """Random walk harga per symbol; sesekali satu symbol dibuat melonjak untuk memicu alert."""
+
+    def __init__(self, symbols, seed=None):
+        self.rng = random.Random(seed)
+        self.open = {symbol: self.rng.uniform(0.01, 50000) for symbol in symbols}
+        self.price = dict(self.open)
+
+    def tick(self, surge_chance=0.01):
+        updates = []
+        now = int(time.time() * 1000)
+        for symbol in self.price:
+            if self.rng.random() > 0.3:  # Seperti Binance, hanya ticker yang berubah yang dikirim
+                continue
+            drift = self.rng.gauss(0, 0.002)
+            if self.rng.random() < surge_chance:
+                drift = self.rng.uniform(0.3, 0.6)
+            self.price[symbol] *= 1 + drift
+            price = self.price[symbol]
+            updates.append({
+                "e": "24hrMiniTicker", "E": now, "s": symbol,
+                "c": f"{price:.8f}", "o": f"{self.open[symbol]:.8f}",
+                "h": f"{max(price, self.open[symbol]):.8f}", "l": f"{min(price, self.open[symbol]):.8f}",
+                "v": f"{self.rng.uniform(1e3, 1e7):.2f}", "q": f"{self.rng.uniform(1e4, 1e8):.2f}",
+            })
+        return updates
+
+
+async def serve(host, port, symbols, interval, drop_after):
+    market = FakeMarket(make_symbols(symbols))
+
+    async def handler(websocket, *_):
+        sent = 0
+        while True:
+            await websocket.send(json.dumps(market.tick()))
+            sent += 1
+            if drop_after and sent >= drop_after:
+                # Memutus koneksi untuk menguji reconnect di sisi client
+                await websocket.close()
+                return
+            await asyncio.sleep(interval)
+
+    async with websockets.serve(handler, host, port):
+        print(f"Fake Binance stream on ws://{host}:{port} ({symbols} symbols)")
+        await asyncio.Future()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--symbols", type=int, default=2000)
+    parser.add_argument("--interval", type=float, default=1.0)
+    parser.add_argument("--drop-after", type=int, default=0, help="putus setelah N pesan (0 = tidak pernah)")
+    args = parser.parse_args()
+    if websockets is None:
+        raise SystemExit("Butuh paket websockets (pip install websockets)")
+    asyncio.run(serve(args.host, args.port, args.symbols, args.interval, args.drop_after))
@@ -1,51 +1,65 @@
-import requests
+import os
+import time
+from dotenv import load_dotenv
+from utils.http_client import http_get
+from utils.json_codec import response_json
 from utils.telegram import send_telegram_message
-from utils.db import session
-from binance.models import BncAlert
+from binance.alert_index import bnc_alert_index
+from binance.triggers import trigger_engine
+
+load_dotenv()
+
+BNC_MODE = os.getenv("BNC_MODE", "")  # "" (nonaktif), "rest" (poll /ticker/24hr) atau "stream" (websocket)
+BNC_SURGE_COOLDOWN = int(os.getenv("BNC_SURGE_COOLDOWN", 3600))  # Detik antar alert lonjakan untuk symbol yang sama
+
+_surge_alerted = {}  # symbol -> waktu alert lonjakan terakhir
+
+
+def process_ticker(symbol, price_change_percent, last_price, high_price, low_price, volume):
+    """Cek satu ticker: lonjakan harga 24 jam dan level harga yang ditembus. Dipakai mode REST maupun stream."""
+    # Cek jika perubahan harga lebih dari 30%
+    if price_change_percent > 30:
+        now = time.monotonic()
+        last_alert = _surge_alerted.get(symbol)
+        if last_alert is None or now - last_alert >= BNC_SURGE_COOLDOWN:
+            _surge_alerted[symbol] = now
+            message = (
+                f"🚀 *ALERT: Lonjakan Harga {symbol}* 🚀\n"
+                f"📈 Perubahan Harga: {price_change_percent:.2f}%\n"
+                f"💰 Harga Terakhir: {last_price}\n"
+                f"📊 Harga Tertinggi: {high_price}\n"
+                f"📉 Harga Terendah: {low_price}\n"
+                f"🔄 Volume: {volume}"
+            )
+            send_telegram_message(message, kind="bnc_surge")
+
+    # Send setup alert, sekali setiap kali harga menembus level
+    price = float(last_price)
+    for level, direction in trigger_engine.update(symbol, price):
+        arrow = "📈" if direction == "up" else "📉"
+        message = (
+            f"🚀 *ALERT: {symbol} menyentuh {level.label} {level.price}* 🚀\n"
+            f"{arrow} Harga Saat Ini: {price}\n"
+        )
+        send_telegram_message(message, kind="bnc_level")
+
 
 def watch_binance():
-    """send notif if 24h priceChangePercent > 30%"""
+    """send notif if 24h priceChangePercent > 30% or a price level is crossed"""
     url = "https://api.binance.com/api/v3/ticker/24hr"
     
     try:
         print("Fetching binance api...")
-        response = requests.get(url)
+        response = http_get(url)
         if response.status_code == 200:
-            data = response.json()
+            data = response_json(response)
+            bnc_alert_index.ensure_fresh()
 
             for ticker in data:
-                symbol = ticker["symbol"]
-                price_change_percent = float(ticker["priceChangePercent"])
-
-                # Cek jika perubahan harga lebih dari 30%
-                if price_change_percent > 30: 
-                    message = (
-                        f"🚀 *ALERT: Lonjakan Harga {symbol}* 🚀\n"
-                        f"📈 Perubahan Harga: {price_change_percent:.2f}%\n"
-                        f"💰 Harga Terakhir: {ticker['lastPrice']}\n"
-                        f"📊 Harga Tertinggi: {ticker['highPrice']}\n"
-                        f"📉 Harga Terendah: {ticker['lowPrice']}\n"
-                        f"🔄 Volume: {ticker['volume']}"
-                    )
-                    send_telegram_message(message)
-
-                # Send setup alert
-                setup_symbol = session.query(BncAlert).filter_by(symbol=symbol).first()
-                if setup_symbol:
-                        last_price = float(ticker['lastPrice'])
-
-                        if last_price >= setup_symbol.higher:
-                            message = (
-                                f"🚀 *ALERT: {symbol} menyentuh higher {setup_symbol.higher}* 🚀\n"
-                                f"📈 Harga Saat Ini: {last_price}\n"
-                            )
-                            send_telegram_message(message)
-                        elif last_price <= setup_symbol.lower:
-                            message = (
-                                f"🚀 *ALERT: {symbol} menyentuh lower {setup_symbol.lower}* 🚀\n"
-                                f"📈 Harga Saat Ini: {last_price}\n"
-                            )
-                            send_telegram_message(message)
+                process_ticker(
+                    ticker["symbol"], float(ticker["priceChangePercent"]), ticker["lastPrice"],
+                    ticker["highPrice"], ticker["lowPrice"], ticker["volume"]
+                )
 
         else:
             print(f"Error Fetching Data: {response.status_code}")
@@ -1,16 +1,31 @@
 from sqlalchemy import ( 
-    Column, String, 
-    Float, Boolean
+    Column, Integer, String, 
+    Float, Boolean, Index
 )
 from utils.db import Base, engine
 
 
 class BncAlert(Base):
-    """send alert if price >= x or <= y"""
+    """send alert when price crosses up through higher or down through lower"""
     __tablename__ = 'bnc_alerts'
     symbol = Column(String(16), primary_key=True)
     higher = Column(Float)
     lower = Column(Float)
     watch = Column(Boolean)
 
+
+class BncPriceLevel(Base):
+    """send alert once each time price crosses a level (many levels per symbol)"""
+    __tablename__ = 'bnc_price_levels'
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    symbol = Column(String(16))
+    price = Column(Float)
+    direction = Column(String(8), default="both")  # up / down / both
+    note = Column(String(255))
+    watch = Column(Boolean, default=True)
+
+    __table_args__ = (
+        Index('idx_symbol', 'symbol'),
+    )
+
 Base.metadata.create_all(engine)
@@ -0,0 +1,83 @@
+import os
+import asyncio
+import threading
+from dotenv import load_dotenv
+from binance.main import process_ticker, watch_binance
+from binance.alert_index import bnc_alert_index
+from utils.json_codec import loads
+
+try:
+    import websockets
+except ImportError:  # Mode stream membutuhkan paket `websockets`
+    websockets = None
+
+load_dotenv()
+
+BNC_STREAM_URL = os.getenv("BNC_STREAM_URL", "wss://stream.binance.com:9443/ws/!miniTicker@arr")
+BNC_STREAM_MAX_BACKOFF = int(os.getenv("BNC_STREAM_MAX_BACKOFF", 60))  # Detik
+
+
+def handle_mini_tickers(payload):
+    """Meneruskan array mini-ticker (`!miniTicker@arr`) ke pengecekan yang sama dengan mode REST."""
+    bnc_alert_index.ensure_fresh()
+    for ticker in payload:
+        open_price = float(ticker["o"])
+        close_price = float(ticker["c"])
+        # Mini-ticker tidak membawa priceChangePercent; open adalah harga 24 jam lalu
+        price_change_percent = (close_price - open_price) / open_price * 100 if open_price else 0.0
+        process_ticker(ticker["s"], price_change_percent, ticker["c"], ticker["h"], ticker["l"], ticker["v"])
+
+
+def _require_websockets():
+    if websockets is None:
+        raise RuntimeError("Mode stream membutuhkan paket websockets (pip install websockets)")
+
+
+async def stream_binance(url=BNC_STREAM_URL, stop_event=None):
+    """Membaca stream mini-ticker semua market dengan reconnect dan backoff eksponensial.
+
+    Setiap kali koneksi (ulang) dibuat, satu poll REST `/ticker/24hr` dijalankan untuk mengisi
+    gap selama terputus; selama stream mati, poll REST itu menjadi fallback tiap interval backoff.
+    """
+    _require_websockets()
+
+    backoff = 1
+    while stop_event is None or not stop_event.is_set():
+        connected = False
+        try:
+            async with websockets.connect(url, ping_interval=20, max_size=None) as ws:
+                connected = True
+                print(f"Binance stream connected: {url}")
+                await asyncio.to_thread(watch_binance)
+                backoff = 1
+                async for raw in ws:
+                    handle_mini_tickers(loads(raw))
+                    if stop_event is not None and stop_event.is_set():
+                        return
+        except Exception as e:
+            print(f"Binance Stream Error: {e}")
+
+        if stop_event is not None and stop_event.is_set():
+            return
+        if not connected:
+            # Stream tidak bisa dihubungi: poll REST supaya alert tetap jalan selama backoff
+            await asyncio.to_thread(watch_binance)
+        print(f"Binance stream reconnecting in {backoff}s")
+        await asyncio.sleep(backoff)
+        backoff = min(backoff * 2, BNC_STREAM_MAX_BACKOFF)
+
+
+def start_binance_stream(url=BNC_STREAM_URL):
+    """Menjalankan `stream_binance` di background thread dengan event loop sendiri.
+
+    Gagal langsung di thread pemanggil jika `websockets` tidak terpasang, supaya proses tidak
+    berjalan terus dengan monitoring Binance diam-diam mati.
+    """
+    _require_websockets()
+    thread = threading.Thread(target=lambda: asyncio.run(stream_binance(url)), name="binance-stream", daemon=True)
+    thread.start()
+    return thread
+
+
+if __name__ == "__main__":
+    asyncio.run(stream_binance())
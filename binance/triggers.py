@@ -0,0 +1,56 @@
+from bisect import bisect_right
+from collections import namedtuple
+
+# direction: "up" (harga naik menembus level), "down" (turun menembus level) atau "both"
+PriceLevel = namedtuple("PriceLevel", ["price", "direction", "label"])
+
+
+class TriggerEngine:
+    """Mendeteksi level harga yang ditembus sejak poll sebelumnya.
+
+    Level disimpan terurut per symbol; dengan bisect pada harga sebelumnya dan harga sekarang
+    hanya level di antara keduanya yang diperiksa, sehingga biaya per ticker sebanding dengan
+    jumlah level yang ditembus. Setiap penembusan hanya menghasilkan satu alert.
+    """
+
+    def __init__(self):
+        self._levels = {}  # symbol -> (list harga terurut, list PriceLevel sejajar)
+        self._last_price = {}
+
+    def load(self, levels):
+        """Mengganti semua level dari iterable (symbol, PriceLevel). Harga terakhir tiap symbol dipertahankan."""
+        by_symbol = {}
+        for symbol, level in levels:
+            by_symbol.setdefault(symbol, []).append(level)
+
+        indexed = {}
+        for symbol, symbol_levels in by_symbol.items():
+            symbol_levels.sort(key=lambda level: level.price)
+            indexed[symbol] = ([level.price for level in symbol_levels], symbol_levels)
+        self._levels = indexed
+
+    def update(self, symbol, price):
+        """Mencatat harga terbaru dan mengembalikan list (PriceLevel, arah) yang ditembus sejak harga sebelumnya."""
+        previous = self._last_price.get(symbol)
+        self._last_price[symbol] = price
+        entry = self._levels.get(symbol)
+        if entry is None or previous is None or price == previous:
+            return []
+
+        prices, levels = entry
+        # Harga >= level dihitung di atas level; alert saat sisi berubah (naik: previous < level <= price,
+        # turun: price < level <= previous), sehingga menyentuh level lalu mundur menghasilkan up lalu down
+        if price > previous:
+            lo, hi, direction = bisect_right(prices, previous), bisect_right(prices, price), "up"
+        else:
+            lo, hi, direction = bisect_right(prices, price), bisect_right(prices, previous), "down"
+
+        # Urutkan sesuai arah pergerakan harga
+        indices = range(lo, hi) if direction == "up" else range(hi - 1, lo - 1, -1)
+        return [
+            (levels[i], direction) for i in indices
+            if levels[i].direction in (direction, "both")
+        ]
+
+
+trigger_engine = TriggerEngine()
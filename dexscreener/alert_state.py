@@ -0,0 +1,134 @@
+import threading
+from datetime import datetime
+from utils.db import session
+from dexscreener.models import Alert
+from utils.metrics import alert_decisions, rows_written
+
+COOLDOWN_PERIOD = 3600  # Cooldown 1 jam (3600 detik)
+ALERT_COLUMNS = (
+    "last_priceUsd", "last_priceChange24h", "last_volume24h",
+    "last_alert_type", "last_alert_time", "dex_id",
+)
+
+
+class AlertStateStore:
+    """Status cooldown alert per token_address yang disimpan di memori.
+
+    Diisi sekali dari dex_alerts, keputusan alert dibuat tanpa query database,
+    dan perubahan ditulis balik sekaligus lewat `flush` di akhir siklus.
+    """
+
+    def __init__(self, persist=True):
+        self.persist = persist
+        self._states = {}
+        self._new = set()
+        self._dirty = set()
+        self._loaded = not persist
+        self._lock = threading.Lock()
+
+    def load(self):
+        """Mengisi ulang state dari tabel dex_alerts."""
+        try:
+            records = session.query(Alert).all()
+            states = {
+                record.token_address: {column: getattr(record, column) for column in ALERT_COLUMNS}
+                for record in records
+            }
+        finally:
+            session.close()
+        with self._lock:
+            self._states = states
+            self._new.clear()
+            self._dirty.clear()
+            self._loaded = True
+        print(f"Alert state loaded: {len(states)} tokens")
+
+    def ensure_loaded(self):
+        if not self._loaded:
+            self.load()
+
+    def update_alert(self, token, alert_type, now=None):
+        """Mencatat alert yang dikirim; ditulis ke database saat `flush`."""
+        token_address = token["token_address"]
+        state = {
+            "last_priceUsd": float(token["priceUsd"]),
+            "last_priceChange24h": float(token["priceChange24h"]),
+            "last_volume24h": float(token["volume24h"]),
+            "last_alert_type": alert_type,
+            "last_alert_time": now or datetime.now(),
+            "dex_id": token["dex_id"],
+        }
+        with self._lock:
+            if token_address not in self._states:
+                self._new.add(token_address)
+            self._states[token_address] = state
+            self._dirty.add(token_address)
+
+    def should_send_alert(self, token, alert_type, now=None):
+        """Cek apakah perlu mengirim notifikasi berdasarkan perubahan signifikan dan cooldown."""
+        self.ensure_loaded()
+        now = now or datetime.now()
+        state = self._states.get(token["token_address"])
+
+        if state is None:
+            # Jika belum pernah ada alert, kirim notifikasi pertama kali
+            self.update_alert(token, alert_type, now)
+            alert_decisions.inc(type=alert_type, decision="sent")
+            return True
+
+        # Hitung waktu sejak notifikasi terakhir
+        time_since_last_alert = now - state["last_alert_time"]
+        if time_since_last_alert.total_seconds() < COOLDOWN_PERIOD:
+            alert_decisions.inc(type=alert_type, decision="cooldown")
+            return False  # Masih dalam cooldown, tidak kirim notifikasi
+
+        # Hitung perubahan
+        price_change_diff = abs(token["priceChange24h"] - state["last_priceChange24h"])
+        volume_change_ratio = token["volume24h"] / max(state["last_volume24h"], 1)
+
+        # Jika terjadi perubahan signifikan, update state dan kirim notifikasi
+        if alert_type == "pump" and price_change_diff > 50:  # Harga berubah lebih dari 50%
+            self.update_alert(token, alert_type, now)
+            alert_decisions.inc(type=alert_type, decision="sent")
+            return True
+        elif alert_type == "rug_pull" and price_change_diff > 50:  # Harga berubah lebih dari 50%
+            self.update_alert(token, alert_type, now)
+            alert_decisions.inc(type=alert_type, decision="sent")
+            return True
+        elif alert_type == "volume_spike" and volume_change_ratio > 2:  # Volume naik lebih dari 2x
+            self.update_alert(token, alert_type, now)
+            alert_decisions.inc(type=alert_type, decision="sent")
+            return True
+
+        alert_decisions.inc(type=alert_type, decision="unchanged")
+        return False  # Tidak ada perubahan signifikan, tidak perlu kirim notifikasi
+
+    def flush(self):
+        """Menulis semua perubahan state ke dex_alerts dalam satu transaksi. Mengembalikan jumlah baris."""
+        with self._lock:
+            dirty, new = self._dirty, self._new
+            self._dirty, self._new = set(), set()
+            rows = [dict(self._states[address], token_address=address) for address in dirty]
+
+        if not self.persist or not rows:
+            return 0
+
+        try:
+            session.bulk_insert_mappings(Alert, [row for row in rows if row["token_address"] in new])
+            session.bulk_update_mappings(Alert, [row for row in rows if row["token_address"] not in new])
+            session.commit()
+            rows_written.inc(len(rows), table="dex_alerts")
+            return len(rows)
+        except Exception as e:
+            session.rollback()
+            print(f"Flush Alert Error: {getattr(e, 'orig', e)}")
+            # Dicoba lagi di flush berikutnya
+            with self._lock:
+                self._dirty |= dirty
+                self._new |= new
+            return 0
+        finally:
+            session.close()
+
+
+alert_state = AlertStateStore()
@@ -0,0 +1,66 @@
+import os
+import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
+from dexscreener.dex_watching import (
+    DEX_BATCH_SIZE, chunk_tokens, fetch_token_details_chunk, fetch_token_details_batch
+)
+
+load_dotenv()
+
+DEX_FETCH_MODE = os.getenv("DEX_FETCH_MODE", "async")  # "async" atau "sync"
+DEX_MAX_IN_FLIGHT = int(os.getenv("DEX_MAX_IN_FLIGHT", 8))
+DEX_REQUESTS_PER_SECOND = float(os.getenv("DEX_REQUESTS_PER_SECOND", 4))
+
+
+class AsyncRateLimiter:
+    """Membatasi laju request menjadi `rate` request per detik dengan jarak tetap antar request."""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_slot = 0.0
+
+    async def acquire(self):
+        if not self.interval:
+            return
+        now = time.monotonic()
+        wait = self._next_slot - now
+        self._next_slot = max(now, self._next_slot) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+async def _fetch_chunk(chain_id, addresses, semaphore, limiter, executor):
+    """Mengambil satu batch alamat tanpa melebihi batas request paralel dan request per detik."""
+    loop = asyncio.get_running_loop()
+    async with semaphore:
+        await limiter.acquire()
+        details = await loop.run_in_executor(executor, fetch_token_details_chunk, addresses)
+    if len(details) < len(addresses):
+        print(f"Fetch Token Details Batch Error ({chain_id}): {len(addresses) - len(details)} token dilewati")
+    return details
+
+
+async def fetch_token_details_async(tokens, max_in_flight=DEX_MAX_IN_FLIGHT,
+                                    requests_per_second=DEX_REQUESTS_PER_SECOND, size=DEX_BATCH_SIZE):
+    """Versi konkuren dari `fetch_token_details_batch` dengan hasil yang sama."""
+    semaphore = asyncio.Semaphore(max_in_flight)
+    limiter = AsyncRateLimiter(requests_per_second)
+    results = {}
+    with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+        tasks = [
+            _fetch_chunk(chain_id, addresses, semaphore, limiter, executor)
+            for chain_id, addresses in chunk_tokens(tokens, size)
+        ]
+        for details in await asyncio.gather(*tasks):
+            results.update(details)
+    return results
+
+
+def fetch_all_token_details(tokens, mode=DEX_FETCH_MODE, max_in_flight=DEX_MAX_IN_FLIGHT,
+                            requests_per_second=DEX_REQUESTS_PER_SECOND):
+    """Mengambil detail semua token memakai mode `async` (konkuren) atau `sync` (satu per satu)."""
+    if mode == "sync":
+        return fetch_token_details_batch(tokens)
+    return asyncio.run(fetch_token_details_async(tokens, max_in_flight, requests_per_second))
@@ -0,0 +1,60 @@
+import os
+import threading
+from datetime import datetime, timedelta
+from dotenv import load_dotenv
+
+load_dotenv()
+
+SNAPSHOT_EPSILON = float(os.getenv("SNAPSHOT_EPSILON", 0.001))  # Perubahan relatif minimal (0.1%)
+SNAPSHOT_HEARTBEAT_MINUTES = int(os.getenv("SNAPSHOT_HEARTBEAT_MINUTES", 60))
+
+METRICS = ("priceUsd", "liquidityUsd", "volume24h", "priceChange24h", "market_cap")
+
+
+class SnapshotChangeFilter:
+    """Menyimpan fingerprint metrik terakhir yang ditulis per pair dan menyaring snapshot yang tidak berubah.
+
+    Snapshot ditulis jika salah satu metrik bergeser lebih dari `epsilon` (relatif) atau jika baris
+    terakhir pair itu sudah lebih tua dari `heartbeat` sehingga pair dorman tetap punya riwayat.
+    """
+
+    def __init__(self, epsilon=SNAPSHOT_EPSILON, heartbeat_minutes=SNAPSHOT_HEARTBEAT_MINUTES):
+        self.epsilon = epsilon
+        self.heartbeat = timedelta(minutes=heartbeat_minutes)
+        self._last = {}  # pair_address -> (tuple metrik, waktu ditulis)
+        self._lock = threading.Lock()
+        self.skipped = 0  # Jumlah write yang dihindari pada panggilan `filter` terakhir
+
+    def _changed(self, previous, current):
+        for old, new in zip(previous, current):
+            if abs(new - old) > self.epsilon * max(abs(old), abs(new), 1e-12):
+                return True
+        return False
+
+    def filter(self, rows):
+        """Mengembalikan baris yang perlu ditulis dan mencatatnya sebagai fingerprint terbaru."""
+        to_write = []
+        with self._lock:
+            for row in rows:
+                pair_address = row["pair_address"]
+                metrics = tuple(row[name] for name in METRICS)
+                created_at = row["created_at"] or datetime.now()
+                last = self._last.get(pair_address)
+                if (
+                    last is None
+                    or created_at - last[1] >= self.heartbeat
+                    or self._changed(last[0], metrics)
+                ):
+                    self._last[pair_address] = (metrics, created_at)
+                    to_write.append(row)
+        self.skipped = len(rows) - len(to_write)
+        return to_write
+
+    def forget(self, pair_addresses):
+        """Menghapus fingerprint pair, mis. jika insert gagal (snapshot berikutnya pasti ditulis) atau token di-retire."""
+        with self._lock:
+            for pair_address in pair_addresses:
+                self._last.pop(pair_address, None)
+
+
+snapshot_filter = SnapshotChangeFilter()
@@ -0,0 +1,70 @@
+import os
+import numpy as np
+import pandas as pd
+from dotenv import load_dotenv
+
+load_dotenv()
+
+DETECTION_WINDOW_MINUTES = int(os.getenv("DETECTION_WINDOW_MINUTES", 60))
+
+DEFAULT_THRESHOLDS = {
+    "pump_price_change": 100,  # Kenaikan harga >100% dalam 24 jam
+    "pump_min_volume": 100000,  # dengan volume tinggi
+    "rug_price_change": -90,  # Penurunan harga >90%
+    "rug_max_liquidity": 5000,  # dengan likuiditas sangat rendah
+    "spike_ratio": 5,  # Volume snapshot terbaru > 5x rata-rata snapshot sebelumnya
+    "spike_lookback": int(os.getenv("VOLUME_SPIKE_LOOKBACK", 5)),  # Jumlah snapshot sebelumnya per pair
+}
+
+
+def latest_with_baseline(df, lookback):
+    """Mengambil snapshot terbaru tiap pair beserta rata-rata volume24h dari `lookback` snapshot sebelumnya.
+
+    Dihitung dengan cumulative sum per pair setelah sort (tanpa loop Python per baris);
+    kolom `prev_volume` bernilai NaN untuk pair yang baru punya satu snapshot.
+    """
+    if df.empty:
+        return df.assign(prev_volume=pd.Series(dtype=float))
+
+    df = df.sort_values(["pair_address", "created_at"], kind="mergesort", ignore_index=True)
+    pairs = df["pair_address"].to_numpy()
+    volume = df["volume24h"].to_numpy(dtype=float)
+
+    # Indeks baris terakhir tiap pair dan posisi baris itu di dalam kelompoknya
+    is_last = np.empty(len(df), dtype=bool)
+    is_last[:-1] = pairs[1:] != pairs[:-1]
+    is_last[-1] = True
+    last_idx = np.flatnonzero(is_last)
+    group_start = np.concatenate(([0], last_idx[:-1] + 1))
+    history = np.minimum(last_idx - group_start, lookback)
+
+    csum = np.concatenate(([0.0], np.cumsum(volume)))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        baseline = (csum[last_idx] - csum[last_idx - history]) / history
+
+    latest = df.iloc[last_idx].reset_index(drop=True)
+    latest["prev_volume"] = np.where(history > 0, baseline, np.nan)
+    return latest
+
+
+def find_signals(df, thresholds=DEFAULT_THRESHOLDS):
+    """Mendeteksi pump, rug pull dan volume spike dari snapshot di window deteksi.
+
+    Setiap pair hanya dinilai dari snapshot terbarunya; volume spike dibandingkan dengan
+    riwayat pair itu sendiri, bukan baris sebelumnya di tabel.
+    """
+    latest = latest_with_baseline(df, thresholds["spike_lookback"])
+    return {
+        "pump": latest[
+            (latest["priceChange24h"] > thresholds["pump_price_change"])
+            & (latest["volume24h"] > thresholds["pump_min_volume"])
+        ],
+        "rug_pull": latest[
+            (latest["priceChange24h"] < thresholds["rug_price_change"])
+            & (latest["liquidityUsd"] < thresholds["rug_max_liquidity"])
+        ],
+        "volume_spike": latest[
+            (latest["prev_volume"] > 0)
+            & (latest["volume24h"] > latest["prev_volume"] * thresholds["spike_ratio"])
+        ],
+    }
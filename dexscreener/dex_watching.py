@@ -1,21 +1,42 @@
-import requests
-from datetime import datetime
-from utils.db import session
-from dexscreener.models import Token, TokenDetail, Alert
-from sqlalchemy.exc import IntegrityError
+import os
+from utils.http_client import http_get
+from utils.json_codec import response_json
+from utils.cache import TTLCache
+import time
+from datetime import datetime, timedelta
+from utils.db import session, insert_ignore_returning, DB_WRITE_BATCH
+from dexscreener.models import Token, TokenDetail, TokenArchive
+from dexscreener.alert_state import alert_state
+from dexscreener.token_index import known_tokens
+from dexscreener.snapshot import PairSnapshot
+from dexscreener.ring_buffer import snapshot_buffer, ANALYSIS_SOURCE
+from dexscreener.recorder import response_recorder
 import pandas as pd
 from utils.telegram import send_telegram_message
 from utils.format import fnum
+from utils.metrics import stage_seconds, rows_written
+from sqlalchemy import text
+from dexscreener.detection import find_signals, DEFAULT_THRESHOLDS, DETECTION_WINDOW_MINUTES
 
 API_URL = "https://api.dexscreener.com/token-profiles/latest/v1"
 DEX_API_URL = "https://api.dexscreener.com/latest/dex/tokens/"
+DEX_BATCH_SIZE = 30  # Maksimal alamat per request ke endpoint tokens (dipisah koma)
+DETAIL_CHUNK_SIZE = DB_WRITE_BATCH  # Jumlah baris per transaksi saat bulk insert TokenDetail
+DEX_CACHE_TTL = float(os.getenv("DEX_CACHE_TTL", 30))  # Detik, sebaiknya di bawah interval siklus
+DEX_CACHE_MAX_MB = float(os.getenv("DEX_CACHE_MAX_MB", 64))
+PAIR_SIZE_BYTES = 4096  # Perkiraan memori satu pair hasil decode JSON
+
+# Cache detail per token_address di depan endpoint tokens, dengan single-flight
+details_cache = TTLCache(DEX_CACHE_TTL, int(DEX_CACHE_MAX_MB * 1024 * 1024))
 
 def fetch_token_data():
     """Mengambil daftar token terbaru dari API Dexscreener."""
     try:
-        response = requests.get(API_URL)
+        response = http_get(API_URL)
+        if response_recorder:
+            response_recorder.record("profiles", response)
         if response.status_code == 200:
-            return response.json()
+            return response_json(response)
         print("Error: Tidak dapat mengambil data token")
     except Exception as e:
         print(f"Fetch Token Error: {e}")
@@ -24,13 +45,78 @@ def fetch_token_data():
 def fetch_token_details(token_address):
     """Mengambil data detail token dari API Dexscreener."""
     try:
-        response = requests.get(DEX_API_URL + token_address)
+        response = http_get(DEX_API_URL + token_address)
+        if response_recorder:
+            response_recorder.record("details", response)
         if response.status_code == 200:
-            return response.json()
+            return response_json(response)
     except Exception as e:
         print(f"Fetch Token Details Error ({token_address}): {e}")
     return None
 
+def _address_key(address):
+    """Alamat EVM (0x...) tidak case-sensitive, alamat lain (mis. Solana) case-sensitive."""
+    return address.lower() if address.startswith("0x") else address
+
+def chunk_tokens(tokens, size=DEX_BATCH_SIZE):
+    """Mengelompokkan (token_address, chain_id) per chain lalu memecahnya menjadi batch berukuran `size`."""
+    by_chain = {}
+    for token_address, chain_id in tokens:
+        by_chain.setdefault(chain_id, []).append(token_address)
+
+    for chain_id, addresses in by_chain.items():
+        for i in range(0, len(addresses), size):
+            yield chain_id, addresses[i:i + size]
+
+def _fetch_token_details_chunk_uncached(addresses):
+    """Mengambil detail beberapa token dalam satu request dan membagikan `pairs` ke masing-masing token.
+
+    Hasilnya sama dengan memanggil `fetch_token_details` per alamat: setiap token mendapat
+    semua pair di mana token tersebut menjadi base atau quote token.
+    """
+    data = fetch_token_details(",".join(addresses))
+    if data is None:
+        return None
+    return split_token_details(addresses, data)
+
+def split_token_details(addresses, data):
+    """Membagi response endpoint tokens untuk beberapa alamat menjadi {alamat: {"pairs": [...]}}."""
+    details = {address: {"pairs": []} for address in addresses}
+    lookup = {_address_key(address): address for address in addresses}
+    for pair in data.get("pairs") or []:
+        matched = set()
+        for side in ("baseToken", "quoteToken"):
+            address = lookup.get(_address_key((pair.get(side) or {}).get("address", "")))
+            if address and address not in matched:
+                details[address]["pairs"].append(pair)
+                matched.add(address)
+    return details
+
+def _details_size(details):
+    return 256 + PAIR_SIZE_BYTES * len(details["pairs"])
+
+def fetch_token_details_chunk(addresses):
+    """Seperti `_fetch_token_details_chunk_uncached`, tetapi lewat `details_cache`.
+
+    Hanya alamat yang belum ada di cache (dan tidak sedang diambil thread lain) yang di-request.
+    Alamat yang gagal diambil tidak ada di dict hasil.
+    """
+    return details_cache.get_many(addresses, _fetch_token_details_chunk_uncached, _details_size)
+
+def fetch_token_details_batch(tokens, size=DEX_BATCH_SIZE):
+    """Mengambil detail banyak token, satu request per batch `size` alamat dari chain yang sama.
+
+    `tokens` berisi tuple (token_address, chain_id). Mengembalikan dict token_address -> {"pairs": [...]};
+    token dari batch yang gagal diambil tidak ikut dikembalikan.
+    """
+    results = {}
+    for chain_id, addresses in chunk_tokens(tokens, size):
+        details = fetch_token_details_chunk(addresses)
+        if len(details) < len(addresses):
+            print(f"Fetch Token Details Batch Error ({chain_id}): {len(addresses) - len(details)} token dilewati")
+        results.update(details)
+    return results
+
 def parse_tokens(token):
     """Parsing data token untuk kompatibilitas database"""
     try:
@@ -41,6 +127,8 @@ def parse_tokens(token):
             "icon": token.get("icon", ""),
             "description": token.get("description", "-"),
             "created_at": datetime.now(),
+            "status": "active",
+            "last_active_at": datetime.now(),
         }
     except Exception as e:
         print(f"Parse Token Error: {e}")
@@ -49,46 +137,62 @@ def parse_tokens(token):
 def parse_token_details(token):
     """Parsing data token untuk kompatibilitas database"""
     try:
-        return {
-            "chain_id": token.get("chainId", ""),
-            "dex_id": token.get("dexId", ""),
-            "url": token.get("url", ""),
-            "pair_address": token.get("pairAddress", ""),
-            "token_address": token.get("baseToken", {}).get("address", "-"),
-            "name": token.get("baseToken", {}).get("name", "-"),
-            "symbol": token.get("baseToken", {}).get("symbol", "-"),
-            "priceUsd": float(token.get("priceUsd", 0)),
-            "liquidityUsd": float(token.get("liquidity", {}).get("usd", 0)),
-            "volume24h": float(token.get("volume", {}).get("h24", 0)),
-            "priceChange24h": float(token.get("priceChange", {}).get("h24", 0)),
-            "market_cap": float(token.get("marketCap", 0)),
-            "created_at": datetime.now(),
-        }
+        return PairSnapshot.from_pair(token, datetime.now()).as_dict()
+    except Exception as e:
+        print(f"Parse Token Error: {e}")
+        return None
+
+def parse_pair_snapshot(pair, created_at=None):
+    """Parsing pair menjadi `PairSnapshot`; satu `created_at` dipakai untuk seluruh siklus."""
+    try:
+        return PairSnapshot.from_pair(pair, created_at or datetime.now())
     except Exception as e:
         print(f"Parse Token Error: {e}")
         return None
 
 def save_tokens(data):
-    """Menyimpan token baru ke database dan mengirim notifikasi jika ada token baru."""
-    new_tokens = []
+    """Menyimpan token baru ke database dengan INSERT IGNORE.
+
+    Mengembalikan tuple (`new_tokens`, `known`): `new_tokens` hanya token yang baris-nya dimasukkan
+    oleh insert ini sendiri (tetap benar dengan beberapa penulis bersamaan), sedangkan `known` semua
+    token yang baru masuk `known_tokens`, termasuk yang sudah lebih dulu dimasukkan penulis lain.
+    Token di `known` belum pernah dijadwalkan proses ini dan harus ditambahkan ke `poll_scheduler`.
+
+    Alamat yang sudah ada di `known_tokens` dilewati tanpa query ke database. Token yang pernah
+    di-retire dan muncul lagi di feed profil dimasukkan kembali lalu dihapus dari arsip.
+    """
+    known_tokens.ensure_loaded()
+    parsed_tokens = {}
     for token in data:
         parsed_token = parse_tokens(token)
-        if not parsed_token:
-            continue
-        
-        try:
-            token_record = Token(**parsed_token)
-            session.add(token_record)
-            session.commit()
-            new_tokens.append(parsed_token)
-        except IntegrityError:
-            session.rollback()
-            continue
-        except Exception as e:
-            session.rollback()
-            print(f"Save Token Error: {e}")
-        finally:
-            session.close()
+        if parsed_token and parsed_token["token_address"] and parsed_token["token_address"] not in known_tokens:
+            parsed_tokens.setdefault(parsed_token["token_address"], parsed_token)
+
+    if not parsed_tokens:
+        return [], []
+
+    try:
+        new_addresses = insert_ignore_returning(session, Token.__table__, list(parsed_tokens.values()), "token_address")
+        new_tokens = [parsed_tokens[address] for address in new_addresses]
+        if new_tokens:
+            revived = session.query(TokenArchive).filter(
+                TokenArchive.token_address.in_(new_addresses)
+            ).delete(synchronize_session=False)
+            if revived:
+                print(f"Revived {revived} archived tokens")
+        session.commit()
+        rows_written.inc(len(new_tokens), table="dex_tokens")
+    except Exception as e:
+        session.rollback()
+        print(f"Save Token Error: {getattr(e, 'orig', e)}")
+        return [], []
+    finally:
+        session.close()
+
+    known = list(parsed_tokens.values())
+    for token in known:
+        known_tokens.add(token["token_address"], token["chain_id"])
+    return new_tokens, known
 
 def save_token_details(data):
     """Menyimpan data harga dan volume token ke database."""
@@ -96,88 +200,88 @@ def save_token_details(data):
         token_detail_record = TokenDetail(**data)
         session.add(token_detail_record)
         session.commit()
+        rows_written.inc(table="dex_token_details")
     except Exception as e:
         session.rollback()
         print(f"Save Token Details Error: {e}")
     finally:
         session.close()
 
-def should_send_alert(token, alert_type):
-    """Cek apakah perlu mengirim notifikasi berdasarkan perubahan signifikan dan cooldown."""
-    alert_record = session.query(Alert).filter_by(token_address=token["token_address"]).first()
-
-    if not alert_record:
-        # Jika belum ada di database, kirim notifikasi pertama kali
-        alert_record = Alert(
-            token_address=token["token_address"],
-            last_priceUsd=token["priceUsd"],
-            last_priceChange24h=token["priceChange24h"],
-            last_volume24h=token["volume24h"],
-            last_alert_type=alert_type,
-            last_alert_time=datetime.now(),
-            dex_id=token["dex_id"]
-        )
-        session.add(alert_record)
-        session.commit()
-        session.close()
-        return True
-
-    # Hitung waktu sejak notifikasi terakhir
-    time_since_last_alert = datetime.now() - alert_record.last_alert_time
-    cooldown_period = 3600  # Cooldown 1 jam (3600 detik)
-
-    if time_since_last_alert.total_seconds() < cooldown_period:
-        return False  # Masih dalam cooldown, tidak kirim notifikasi
-
-    # Hitung perubahan
-    price_change_diff = abs(token["priceChange24h"] - alert_record.last_priceChange24h)
-    volume_change_ratio = token["volume24h"] / max(alert_record.last_volume24h, 1)
-
-    # Jika terjadi perubahan signifikan, update database dan kirim notifikasi
-    if alert_type == "pump" and price_change_diff > 50:  # Harga berubah lebih dari 50%
-        update_alert(token, alert_type)
-        return True
-    elif alert_type == "rug_pull" and price_change_diff > 50:  # Harga berubah lebih dari 50%
-        update_alert(token, alert_type)
-        return True
-    elif alert_type == "volume_spike" and volume_change_ratio > 2:  # Volume naik lebih dari 2x
-        update_alert(token, alert_type)
-        return True
-
-    return False  # Tidak ada perubahan signifikan, tidak perlu kirim notifikasi
-
-def update_alert(token, alert_type):
-    """Update status alert di database"""
-    alert_record = session.query(Alert).filter_by(token_address=token["token_address"]).first()
-    if alert_record:
-        alert_record.last_priceUsd = token["priceUsd"]
-        alert_record.last_priceChange24h = token["priceChange24h"]
-        alert_record.last_volume24h = token["volume24h"]
-        alert_record.last_alert_type = alert_type
-        alert_record.last_alert_time = datetime.now()
-        alert_record.dex_id = token["dex_id"]
-        session.commit()
-        session.close()
+def _as_mapping(row):
+    return row.as_dict() if isinstance(row, PairSnapshot) else row
+
+def _save_token_detail_rows(rows):
+    """Menyimpan baris satu per satu; dipakai untuk chunk yang gagal agar baris yang valid tetap tersimpan."""
+    saved = 0
+    for row in rows:
+        try:
+            session.execute(TokenDetail.__table__.insert(), _as_mapping(row))
+            session.commit()
+            saved += 1
+        except Exception as e:
+            session.rollback()
+            print(f"Save Token Details Error ({row.get('pair_address')}): {getattr(e, 'orig', e)}")
+    return saved
+
+def save_token_details_bulk(rows, chunk_size=DETAIL_CHUNK_SIZE):
+    """Menyimpan banyak snapshot token (dict atau `PairSnapshot`) dengan multi-row insert, satu transaksi per chunk.
 
-def analyze_market():
-    """Menganalisis tren pasar seperti Pump, Rug Pull, dan Volume Spike."""
+    Jika sebuah chunk gagal, chunk itu diulang per baris sehingga hanya baris yang bermasalah yang hilang.
+    Mengembalikan jumlah baris yang tersimpan.
+    """
+    if not rows:
+        return 0
+
+    start = time.perf_counter()
+    saved = 0
     try:
-        df = pd.read_sql_query("SELECT * FROM dex_token_details ORDER BY created_at DESC LIMIT 200", session.bind)
+        for i in range(0, len(rows), chunk_size):
+            chunk = rows[i:i + chunk_size]
+            try:
+                session.execute(TokenDetail.__table__.insert(), [_as_mapping(row) for row in chunk])
+                session.commit()
+                saved += len(chunk)
+            except Exception as e:
+                session.rollback()
+                print(f"Save Token Details Bulk Error (chunk {i // chunk_size}): {getattr(e, 'orig', e)}")
+                saved += _save_token_detail_rows(chunk)
+    finally:
+        session.close()
 
-        # Deteksi PUMP (kenaikan harga >100% dalam 24 jam, volume tinggi)
-        pump_tokens = df[(df["priceChange24h"] > 100) & (df["volume24h"] > 100000)]
-        
-        # Deteksi RUG PULL (penurunan harga >90%, likuiditas sangat rendah)
-        rug_pull_tokens = df[(df["priceChange24h"] < -90) & (df["liquidityUsd"] < 5000)]
+    elapsed = time.perf_counter() - start
+    stage_seconds.observe(elapsed, stage="db_write")
+    rows_written.inc(saved, table="dex_token_details")
+    print(f"Saved {saved}/{len(rows)} token details in {elapsed:.2f}s ({saved / max(elapsed, 1e-9):.0f} rows/s)")
+    return saved
 
-        # Deteksi VOLUME SPIKE (kenaikan volume > 500% dalam 24 jam)
-        df["prev_volume"] = df["volume24h"].shift(1)
-        volume_spike_tokens = df[(df["prev_volume"] > 0) & (df["volume24h"] > df["prev_volume"] * 5)]
+def analyze_market(thresholds=DEFAULT_THRESHOLDS, window_minutes=DETECTION_WINDOW_MINUTES, source=ANALYSIS_SOURCE,
+                   now=None, state=None, send=None):
+    """Menganalisis tren pasar seperti Pump, Rug Pull, dan Volume Spike per pair dalam window waktu tertentu.
+
+    `source="memory"` membaca snapshot dari ring buffer di memori, `source="db"` dari tabel dex_token_details.
+    `now`, `state` dan `send` bisa diganti untuk replay: waktu siklus, AlertStateStore dan pengirim pesan.
+    """
+    now = now or datetime.now()
+    state = state or alert_state
+    send = send or send_telegram_message
+    try:
+        since = now - timedelta(minutes=window_minutes)
+        if source == "memory":
+            df = snapshot_buffer.to_frame(since)
+        else:
+            df = pd.read_sql_query(
+                text("SELECT * FROM dex_token_details WHERE created_at >= :since"),
+                session.bind, params={"since": since}
+            )
+
+        signals = find_signals(df, thresholds)
+        pump_tokens = signals["pump"]
+        rug_pull_tokens = signals["rug_pull"]
+        volume_spike_tokens = signals["volume_spike"]
 
         # Kirim notifikasi jika ada kejadian signifikan 
-        for _, row in pump_tokens.iterrows():
-            token = row.to_dict()
-            if should_send_alert(token, "pump"):
+        for token in pump_tokens.to_dict("records"):
+            if state.should_send_alert(token, "pump", now):
                 message = f"""
 🚀 *Pump Detected!*
 
@@ -187,11 +291,10 @@ def analyze_market():
 🔹 *Price:* ${fnum(token['priceUsd'])}  
 🔹 *DEX:* {token['dex_id']}
 """
-                send_telegram_message(message, True)
+                send(message, True, kind="pump")
 
-        for _, row in rug_pull_tokens.iterrows():
-            token = row.to_dict()
-            if should_send_alert(token, "rug_pull"):
+        for token in rug_pull_tokens.to_dict("records"):
+            if state.should_send_alert(token, "rug_pull", now):
                 message = f"""
 *💀 Rug Pull Detected:*
 
@@ -201,11 +304,10 @@ def analyze_market():
 🔹 *Price:* ${fnum(token['priceUsd'])}  
 🔹 *DEX:* {token['dex_id']}
 """
-                send_telegram_message(message, True)
+                send(message, True, kind="rug_pull")
 
-        for _, row in volume_spike_tokens.iterrows():
-            token = row.to_dict()
-            if should_send_alert(token, "volume_spike"):
+        for token in volume_spike_tokens.to_dict("records"):
+            if state.should_send_alert(token, "volume_spike", now):
                 message = f"""
 *📈 Volume Spike Detected:*
 
@@ -215,6 +317,8 @@ def analyze_market():
 🔹 *Liquidity:* ${fnum(token['liquidityUsd'])}
 🔹 *Dex:* {token['dex_id']}
 """
-                send_telegram_message(message, True)
+                send(message, True, kind="volume_spike")
     except Exception as e:
-        print(f"Analyze Market Error: {e}")
\ No newline at end of file
+        print(f"Analyze Market Error: {e}")
+    finally:
+        state.flush()
\ No newline at end of file
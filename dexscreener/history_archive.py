@@ -0,0 +1,190 @@
+import os
+import glob
+import uuid
+import numpy as np
+import pandas as pd
+from datetime import datetime, timedelta
+from dotenv import load_dotenv
+from sqlalchemy import bindparam, text
+from utils.db import Session
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Arsip Parquet membutuhkan paket `pyarrow`
+    pa = pq = None
+
+load_dotenv()
+
+ARCHIVE_ENABLED = os.getenv("ARCHIVE_ENABLED", "0") == "1"  # Job arsip menghapus baris dari database, jadi opt-in
+ARCHIVE_DIR = os.getenv("ARCHIVE_DIR", "archive/dex_token_details")
+ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", 7))  # Hari penuh yang tetap disimpan di database
+ARCHIVE_COMPRESSION = os.getenv("ARCHIVE_COMPRESSION", "zstd")
+ARCHIVE_INTERVAL = int(os.getenv("ARCHIVE_INTERVAL", 86400))  # Detik antar run job arsip
+ARCHIVE_READ_CHUNK = 100000  # Baris per query saat export
+ARCHIVE_DELETE_CHUNK = 1000  # Id per DELETE (satu transaksi) agar lock tabel tetap pendek
+
+STRING_COLUMNS = ["chain_id", "dex_id", "url", "token_address", "pair_address", "name", "symbol"]
+FLOAT_COLUMNS = ["priceUsd", "liquidityUsd", "volume24h", "priceChange24h", "market_cap"]
+DAY_RANGE = "created_at >= :start AND created_at < :end"
+
+
+def _schema():
+    # Schema tetap supaya kolom yang seluruhnya NULL di satu partisi tidak berubah tipe
+    return pa.schema(
+        [("id", pa.int64())]
+        + [(column, pa.string()) for column in STRING_COLUMNS]
+        + [(column, pa.float64()) for column in FLOAT_COLUMNS]
+        + [("created_at", pa.timestamp("us"))]
+    )
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise RuntimeError("Arsip Parquet membutuhkan paket pyarrow (pip install pyarrow)")
+
+
+def _partition_dir(day, chain_id):
+    return os.path.join(ARCHIVE_DIR, f"day={day.isoformat()}", f"chain_id={chain_id}")
+
+
+def _day_params(day):
+    start = datetime.combine(day, datetime.min.time())
+    return {"start": start, "end": start + timedelta(days=1)}
+
+
+def _archived_ids(day):
+    """Semua id yang sudah ada di file Parquet partisi `day` (semua chain), dibaca ulang dari disk."""
+    arrays = [
+        pq.read_table(path, columns=["id"]).column("id").to_numpy()
+        for path in glob.glob(os.path.join(_partition_dir(day, "*"), "*.parquet"))
+    ]
+    return np.unique(np.concatenate(arrays)) if arrays else np.empty(0, dtype=np.int64)
+
+
+def export_day(db, day, archived_ids):
+    """Menulis snapshot `day` yang id-nya belum ada di `archived_ids` ke file Parquet baru, satu per chain.
+
+    Setiap export membuat part file dengan nama unik (ditulis ke `.tmp` lalu di-rename) dan tidak pernah
+    menimpa part yang sudah ada, karena baris di part lama mungkin sudah dihapus dari database.
+    Mengembalikan jumlah baris tertulis.
+    """
+    _require_pyarrow()
+    schema = _schema()
+    params = _day_params(day)
+    part_name = f"part-{datetime.now().strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:8]}.parquet"
+    writers = {}
+    written = 0
+    try:
+        chunks = pd.read_sql_query(
+            text(f"SELECT * FROM dex_token_details WHERE {DAY_RANGE} ORDER BY chain_id, created_at"),
+            db.connection(), params=params, chunksize=ARCHIVE_READ_CHUNK
+        )
+        for chunk in chunks:
+            chunk = chunk[~chunk["id"].isin(archived_ids)]
+            if chunk.empty:
+                continue
+            chunk["created_at"] = pd.to_datetime(chunk["created_at"])
+            for chain_id, rows in chunk.groupby(chunk["chain_id"].fillna("unknown"), sort=False):
+                if chain_id not in writers:
+                    path = os.path.join(_partition_dir(day, chain_id), part_name)
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    writer = pq.ParquetWriter(
+                        path + ".tmp", schema, compression=ARCHIVE_COMPRESSION, use_dictionary=STRING_COLUMNS
+                    )
+                    writers[chain_id] = (writer, path)
+                table = pa.Table.from_pandas(rows[schema.names], schema=schema, preserve_index=False)
+                writers[chain_id][0].write_table(table)
+                written += len(rows)
+    except Exception:
+        for writer, path in writers.values():
+            writer.close()
+            os.remove(path + ".tmp")
+        raise
+
+    for writer, path in writers.values():
+        writer.close()
+        os.replace(path + ".tmp", path)
+    return written
+
+
+def delete_ids(db, ids):
+    """Menghapus baris dex_token_details berdasarkan id, commit per ARCHIVE_DELETE_CHUNK id."""
+    statement = text("DELETE FROM dex_token_details WHERE id IN :ids").bindparams(bindparam("ids", expanding=True))
+    deleted = 0
+    for i in range(0, len(ids), ARCHIVE_DELETE_CHUNK):
+        result = db.execute(statement, {"ids": [int(value) for value in ids[i:i + ARCHIVE_DELETE_CHUNK]]})
+        db.commit()
+        deleted += result.rowcount
+    return deleted
+
+
+def archive_day(db, day):
+    """Export lalu hapus satu hari. Hanya id yang terbaca ulang dari file Parquet yang dihapus dari database.
+
+    Jika penghapusan gagal di tengah jalan, baris yang tersisa sudah ada di Parquet: run berikutnya
+    tidak mengexportnya lagi dan langsung menghapusnya.
+    """
+    params = _day_params(day)
+    if not db.execute(text(f"SELECT COUNT(*) FROM dex_token_details WHERE {DAY_RANGE}"), params).scalar():
+        return
+    written = export_day(db, day, _archived_ids(day))
+
+    archived = _archived_ids(day)
+    db_ids = np.array(
+        [row[0] for row in db.execute(text(f"SELECT id FROM dex_token_details WHERE {DAY_RANGE}"), params)],
+        dtype=np.int64
+    )
+    missing = np.setdiff1d(db_ids, archived)
+    if missing.size:
+        print(f"Archive {day}: {missing.size}/{db_ids.size} rows not found in Parquet, keeping database rows")
+        return
+    deleted = delete_ids(db, np.intersect1d(db_ids, archived))
+    print(f"Archived {day}: {written} new rows ({archived.size} total in Parquet), deleted {deleted}")
+
+
+def run_archive(now=None):
+    """Memindahkan hari-hari yang sudah lewat ARCHIVE_AFTER_DAYS dari dex_token_details ke Parquet.
+
+    Hari yang gagal diexport atau dihapus tetap (sebagian) di database dan dilanjutkan pada run berikutnya.
+    """
+    _require_pyarrow()
+    now = now or datetime.now()
+    cutoff = now.date() - timedelta(days=ARCHIVE_AFTER_DAYS)
+    db = Session()
+    try:
+        oldest = db.execute(text("SELECT MIN(created_at) FROM dex_token_details")).scalar()
+        if oldest is None:
+            return
+        if isinstance(oldest, str):  # SQLite mengembalikan DATETIME sebagai string pada query mentah
+            oldest = datetime.fromisoformat(oldest)
+        day = oldest.date()
+        while day < cutoff:
+            try:
+                archive_day(db, day)
+            except Exception as e:
+                db.rollback()
+                print(f"Archive Error {day}: {getattr(e, 'orig', e)}")
+            day += timedelta(days=1)
+    finally:
+        Session.remove()
+
+
+def read_history(start, end, chain_id=None, columns=None):
+    """Membaca snapshot arsip dengan `start <= created_at < end` sebagai DataFrame, opsional satu chain saja."""
+    _require_pyarrow()
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+    frames = []
+    day = start.normalize()
+    while day < end:
+        pattern = _partition_dir(day.date(), chain_id if chain_id is not None else "*")
+        for path in sorted(glob.glob(os.path.join(pattern, "*.parquet"))):
+            read_columns = None if columns is None else sorted(set(columns) | {"created_at"})
+            frame = pq.read_table(path, columns=read_columns).to_pandas()
+            frames.append(frame[(frame["created_at"] >= start) & (frame["created_at"] < end)])
+        day += pd.Timedelta(days=1)
+
+    if not frames:
+        return pd.DataFrame(columns=columns or _schema().names)
+    df = pd.concat(frames, ignore_index=True)
+    return df[columns] if columns else df
@@ -0,0 +1,124 @@
+import os
+import threading
+from datetime import datetime, timedelta
+from dotenv import load_dotenv
+from sqlalchemy import bindparam, literal, or_, select
+from utils.db import Session
+from dexscreener.models import Token, TokenArchive
+from dexscreener.token_index import known_tokens
+from dexscreener.poll_scheduler import poll_scheduler, POLL_INTERVALS
+from dexscreener.ring_buffer import snapshot_buffer
+from dexscreener.change_filter import snapshot_filter
+
+load_dotenv()
+
+TOKEN_DORMANT_AFTER_HOURS = float(os.getenv("TOKEN_DORMANT_AFTER_HOURS", 24))
+TOKEN_RETIRE_AFTER_HOURS = float(os.getenv("TOKEN_RETIRE_AFTER_HOURS", 7 * 24))
+TOKEN_LIFECYCLE_INTERVAL = int(os.getenv("TOKEN_LIFECYCLE_INTERVAL", 3600))  # Detik
+ARCHIVE_CHUNK_SIZE = 1000
+
+tokens_table = Token.__table__
+archive_table = TokenArchive.__table__
+
+# Sebelum semua tier sempat di-poll sekali, aktivitas token belum lengkap (mis. setelah downtime)
+STARTUP_GRACE = timedelta(seconds=max(POLL_INTERVALS.values()))
+_started_at = datetime.now()
+
+_activity = {}  # token_address -> waktu terakhir terlihat aktif, belum disimpan ke database
+_activity_lock = threading.Lock()
+
+
+def record_activity(token_address, rows, now=None):
+    """Mencatat token sebagai aktif jika salah satu pair-nya masih punya liquidity dan volume."""
+    if any(row["liquidityUsd"] > 0 and row["volume24h"] > 0 for row in rows):
+        with _activity_lock:
+            _activity[token_address] = now or datetime.now()
+
+
+def _flush_activity(db, now):
+    """Menyimpan aktivitas dari memori ke kolom last_active_at dan mengaktifkan kembali token dormant."""
+    with _activity_lock:
+        activity = list(_activity.items())
+        _activity.clear()
+
+    if activity:
+        db.execute(
+            tokens_table.update()
+            .where(tokens_table.c.token_address == bindparam("address"))
+            .values(last_active_at=bindparam("active_at"), status="active"),
+            [{"address": address, "active_at": active_at} for address, active_at in activity],
+        )
+
+    # Token lama yang belum pernah dicatat mendapat masa tenggang penuh mulai sekarang
+    db.execute(
+        tokens_table.update()
+        .where(tokens_table.c.last_active_at.is_(None))
+        .values(last_active_at=now, status="active")
+    )
+    return len(activity)
+
+
+def _archive_tokens(db, addresses, now):
+    """Memindahkan token ke dex_tokens_archive dan menghapusnya dari dex_tokens dalam satu transaksi."""
+    columns = ["token_address", "chain_id", "url", "icon", "description", "created_at", "last_active_at"]
+    source = select(*[tokens_table.c[name] for name in columns], literal(now).label("archived_at")) \
+        .where(tokens_table.c.token_address.in_(addresses))
+
+    db.execute(archive_table.delete().where(archive_table.c.token_address.in_(addresses)))
+    db.execute(archive_table.insert().from_select(columns + ["archived_at"], source))
+    db.execute(tokens_table.delete().where(tokens_table.c.token_address.in_(addresses)))
+
+
+def run_lifecycle(now=None):
+    """Menandai token dormant dan memindahkan token retired ke arsip.
+
+    Token dianggap tidak aktif jika tidak punya pair, liquidity nol, atau volume nol sejak `last_active_at`.
+    Token retired dikeluarkan dari `known_tokens`, `poll_scheduler`, `snapshot_buffer` dan `snapshot_filter`
+    sehingga loop utama tidak menyentuhnya lagi.
+    """
+    now = now or datetime.now()
+    dormant_cutoff = now - timedelta(hours=TOKEN_DORMANT_AFTER_HOURS)
+    retire_cutoff = now - timedelta(hours=TOKEN_RETIRE_AFTER_HOURS)
+    db = Session()
+    retired = 0
+    try:
+        flushed = _flush_activity(db, now)
+        if now - _started_at < STARTUP_GRACE:
+            db.commit()
+            print(f"Token lifecycle: {flushed} active, retirement paused until every tier has been polled")
+            return 0
+
+        dormant = db.execute(
+            tokens_table.update()
+            .where(or_(tokens_table.c.status == "active", tokens_table.c.status.is_(None)))
+            .where(tokens_table.c.last_active_at < dormant_cutoff)
+            .values(status="dormant")
+        ).rowcount
+        db.commit()
+
+        addresses = [
+            row[0] for row in
+            db.execute(select(tokens_table.c.token_address).where(tokens_table.c.last_active_at < retire_cutoff))
+        ]
+        for i in range(0, len(addresses), ARCHIVE_CHUNK_SIZE):
+            chunk = addresses[i:i + ARCHIVE_CHUNK_SIZE]
+            try:
+                _archive_tokens(db, chunk, now)
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                print(f"Archive Token Error: {getattr(e, 'orig', e)}")
+                continue
+            for token_address in chunk:
+                known_tokens.discard(token_address)
+                poll_scheduler.remove(token_address)
+            snapshot_filter.forget(snapshot_buffer.remove_tokens(chunk))
+            retired += len(chunk)
+
+        print(f"Token lifecycle: {flushed} active, {dormant} dormant, {retired} retired, {len(known_tokens)} tracked")
+    except Exception as e:
+        db.rollback()
+        print(f"Token Lifecycle Error: {getattr(e, 'orig', e)}")
+    finally:
+        Session.remove()
+    return retired
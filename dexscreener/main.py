@@ -1,28 +1,90 @@
 import time
-from utils.db import session
+from datetime import datetime
 from dexscreener.dex_watching import (
-    fetch_token_data, fetch_token_details, save_tokens, 
-    save_token_details, analyze_market, parse_token_details
+    fetch_token_data, save_tokens, 
+    save_token_details_bulk, analyze_market, parse_pair_snapshot, details_cache
 )
-from dexscreener.models import Token
+from dexscreener.async_fetch import fetch_all_token_details
+from dexscreener.token_index import known_tokens
+from dexscreener.poll_scheduler import poll_scheduler
+from dexscreener.lifecycle import record_activity
+from dexscreener.change_filter import snapshot_filter
+from dexscreener.ring_buffer import snapshot_buffer, RING_BUFFER_REBUILD
+from dexscreener.detection import DETECTION_WINDOW_MINUTES
+from dexscreener.recorder import response_recorder
+from dexscreener.snapshot import dedupe_snapshots
+from utils.metrics import stage_seconds
 
 
 def watch_dexscreener():
     """Kode utama untuk mengambil dan menyimpan data token setiap 60 detik,
     menganalisis market mana token yang pump, rug pull dan mendeteksi kenaikan volume yang signifikan"""
 
-    token_data = fetch_token_data()
+    known_tokens.ensure_loaded()
+    if not poll_scheduler.seeded:
+        poll_scheduler.seed(known_tokens.items(), known_tokens.dormant())
+    if RING_BUFFER_REBUILD and not snapshot_buffer.loaded:
+        snapshot_buffer.rebuild_from_db(DETECTION_WINDOW_MINUTES)
+
+    with stage_seconds.time(stage="fetch_profiles"):
+        token_data = fetch_token_data()
     if token_data:
-        save_tokens(token_data)
+        with stage_seconds.time(stage="save_tokens"):
+            _, known = save_tokens(token_data)
+        # Semua token yang baru masuk indeks dijadwalkan, termasuk yang dimasukkan penulis lain
+        for token in known:
+            poll_scheduler.add(token["token_address"], token["chain_id"])
+
+    # Hanya token yang sudah jatuh tempo menurut tier aktivitasnya yang diambil
+    token_list = poll_scheduler.pop_due()
+    print(f"Fetching {len(token_list)}/{len(known_tokens)} tokens... {poll_scheduler.tier_counts()}")
+    try:
+        with stage_seconds.time(stage="fetch"):
+            token_details_map = fetch_all_token_details(token_list)
+        cycle_time = datetime.now()  # Satu timestamp untuk semua snapshot di siklus ini
+        print(f"Details cache: {details_cache.stats()}")
+        parse_started = time.perf_counter()
+        detail_rows = []
+        for token_address, chain_id in token_list:
+            token_details = token_details_map.get(token_address)
+            if token_details is None:
+                # Batch gagal diambil, coba lagi di siklus berikutnya
+                poll_scheduler.add(token_address, chain_id)
+                continue
 
-    token_list = session.query(Token.token_address).all()
-    for token in token_list:
-        print(f"Fetching token {token[0]}...")
-        token_details = fetch_token_details(token[0])
-        if token_details and token_details.get("pairs") is not None:
+            rows = []
             for pair in token_details["pairs"]:
-                parsed_data = parse_token_details(pair)
-                if parsed_data:
-                    save_token_details(parsed_data)
+                snapshot = parse_pair_snapshot(pair, cycle_time)
+                if snapshot:
+                    rows.append(snapshot)
+            record_activity(token_address, rows)
+            # Token yang di-retire selama fetch berjalan tidak dijadwalkan ulang
+            if token_address in known_tokens:
+                poll_scheduler.reschedule(token_address, chain_id, rows)
+            detail_rows.extend(rows)
+    finally:
+        # Token yang gagal diproses karena exception di tengah siklus dikembalikan ke antrian
+        requeued = poll_scheduler.requeue_in_flight()
+        if requeued:
+            print(f"Requeued {requeued} unprocessed tokens")
+    stage_seconds.observe(time.perf_counter() - parse_started, stage="parse")
+
+    ingest_snapshots(detail_rows)
+    if response_recorder:
+        response_recorder.end_cycle()
+
+    with stage_seconds.time(stage="analyze"):
+        analyze_market()
+
+
+def ingest_snapshots(detail_rows):
+    """Menyimpan snapshot satu siklus ke ring buffer dan ke database. Dipakai juga oleh replay."""
+    detail_rows = dedupe_snapshots(detail_rows)
+    # Ring buffer menyimpan semua snapshot untuk analisis, termasuk yang tidak ditulis ke database
+    snapshot_buffer.append(detail_rows)
 
-    analyze_market()
\ No newline at end of file
+    # Snapshot yang metriknya tidak berubah (di luar heartbeat) tidak ditulis ulang
+    rows_to_write = snapshot_filter.filter(detail_rows)
+    print(f"Skipped {snapshot_filter.skipped}/{len(detail_rows)} unchanged token details")
+    if save_token_details_bulk(rows_to_write) < len(rows_to_write):
+        snapshot_filter.forget(row["pair_address"] for row in rows_to_write)
\ No newline at end of file
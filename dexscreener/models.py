@@ -2,7 +2,7 @@ from sqlalchemy import (
     Column, Integer, String, 
     Float, DateTime, Text, Index
 )
-from utils.db import Base, engine
+from utils.db import Base, engine, add_missing_columns
 
 
 class Token(Base):
@@ -14,12 +14,27 @@ class Token(Base):
     icon = Column(String(255))
     description = Column(Text)
     created_at = Column(DateTime)
+    status = Column(String(16), default="active")  # active / dormant; token retired dipindah ke dex_tokens_archive
+    last_active_at = Column(DateTime)  # Terakhir terlihat punya pair dengan liquidity dan volume
 
     __table_args__ = (
         Index('idx_created_at', 'created_at'),
     )
 
 
+class TokenArchive(Base):
+    """Token yang sudah retired, dipindahkan dari dex_tokens agar set token aktif tetap kecil"""
+    __tablename__ = 'dex_tokens_archive'
+    token_address = Column(String(255), primary_key=True)
+    chain_id = Column(String(50))
+    url = Column(String(255))
+    icon = Column(String(255))
+    description = Column(Text)
+    created_at = Column(DateTime)
+    last_active_at = Column(DateTime)
+    archived_at = Column(DateTime)
+
+
 class TokenDetail(Base):
     __tablename__ = 'dex_token_details'
     id = Column(Integer, primary_key=True, autoincrement=True)
@@ -39,7 +54,8 @@ class TokenDetail(Base):
 
     __table_args__ = (
         Index('idx_token_address', 'token_address'),
-        Index('idx_created_at', 'created_at'),
+        # Nama index unik per database (SQLite), berbeda dengan idx_created_at milik dex_tokens
+        Index('idx_detail_created_at', 'created_at'),
     )
 
 class Alert(Base):
@@ -54,3 +70,5 @@ class Alert(Base):
 
 # Crate table
 Base.metadata.create_all(engine)
+# Kolom lifecycle yang ditambahkan setelah dex_tokens sudah ada di database lama
+add_missing_columns(Token.__table__, ["status", "last_active_at"])
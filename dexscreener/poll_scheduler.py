@@ -0,0 +1,150 @@
+import heapq
+import itertools
+import threading
+import time
+
+# Interval polling per tier (detik). Tier "hot" diambil setiap siklus.
+POLL_INTERVALS = {
+    "hot": 0,
+    "warm": 5 * 60,
+    "cool": 30 * 60,
+    "dormant": 3 * 60 * 60,
+}
+
+# Batas minimal (liquidity USD, volume 24 jam USD, pergerakan harga % sejak snapshot terakhir) per tier
+TIER_THRESHOLDS = (
+    ("hot", 50_000, 100_000, 5.0),
+    ("warm", 10_000, 10_000, 1.0),
+    ("cool", 1_000, 1_000, 0.1),
+)
+
+
+def classify_activity(liquidity, volume24h, price_move):
+    """Menentukan tier polling dari aktivitas token; cukup satu metrik yang melewati batas tier."""
+    for tier, min_liquidity, min_volume, min_move in TIER_THRESHOLDS:
+        if liquidity >= min_liquidity or volume24h >= min_volume or price_move >= min_move:
+            return tier
+    return "dormant"
+
+
+class PollScheduler:
+    """Priority queue waktu polling berikutnya per token, dengan interval sesuai tier aktivitas.
+
+    Token baru langsung jatuh tempo; setelah diambil, token dijadwalkan ulang lewat `reschedule`
+    berdasarkan liquidity, volume dan pergerakan harga dari snapshot-nya. Token yang sudah dikeluarkan
+    `pop_due` tapi belum dijadwalkan ulang dicatat sebagai in-flight dan bisa dikembalikan lewat
+    `requeue_in_flight` jika siklus gagal di tengah jalan.
+    """
+
+    def __init__(self):
+        self._heap = []  # (due_at, seq, token_address)
+        self._entries = {}  # token_address -> (due_at, chain_id)
+        self._last_price = {}
+        self._tiers = {}
+        self._in_flight = {}  # token_address -> chain_id, sudah di-pop tapi belum dijadwalkan ulang
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self.seeded = False
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, token_address):
+        return token_address in self._entries
+
+    def _push(self, token_address, chain_id, due_at):
+        self._in_flight.pop(token_address, None)
+        self._entries[token_address] = (due_at, chain_id)
+        heapq.heappush(self._heap, (due_at, next(self._seq), token_address))
+
+    def add(self, token_address, chain_id, due_at=None):
+        """Menjadwalkan token; tanpa `due_at` token jatuh tempo di siklus berikutnya."""
+        with self._lock:
+            self._push(token_address, chain_id, time.time() if due_at is None else due_at)
+
+    def seed(self, tokens, dormant=()):
+        """Menjadwalkan semua token (token_address, chain_id) yang belum ada di scheduler.
+
+        Token di `dormant` langsung masuk tier dormant; jadwalnya disebar merata sepanjang satu
+        interval dormant agar tidak jatuh tempo bersamaan. Token lain jatuh tempo di siklus berikutnya.
+        """
+        now = time.time()
+        interval = POLL_INTERVALS["dormant"]
+        with self._lock:
+            pending = [(token_address, chain_id) for token_address, chain_id in tokens
+                       if token_address not in self._entries]
+            dormant_tokens = [token for token in pending if token[0] in dormant]
+            for token_address, chain_id in pending:
+                if token_address not in dormant:
+                    self._push(token_address, chain_id, now)
+            for i, (token_address, chain_id) in enumerate(dormant_tokens):
+                self._tiers[token_address] = "dormant"
+                self._push(token_address, chain_id, now + interval * i / len(dormant_tokens))
+            self.seeded = True
+
+    def remove(self, token_address):
+        with self._lock:
+            self._entries.pop(token_address, None)
+            self._in_flight.pop(token_address, None)
+            self._last_price.pop(token_address, None)
+            self._tiers.pop(token_address, None)
+
+    def pop_due(self, now=None):
+        """Mengeluarkan semua token yang sudah jatuh tempo sebagai list (token_address, chain_id)."""
+        now = time.time() if now is None else now
+        due = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                due_at, _, token_address = heapq.heappop(self._heap)
+                entry = self._entries.get(token_address)
+                # Entri lama (sudah dijadwalkan ulang atau dihapus) dilewati
+                if entry is None or entry[0] != due_at:
+                    continue
+                del self._entries[token_address]
+                self._in_flight[token_address] = entry[1]
+                due.append((token_address, entry[1]))
+        return due
+
+    def requeue_in_flight(self, now=None):
+        """Menjadwalkan ulang (langsung jatuh tempo) token hasil `pop_due` yang belum di-`reschedule`/`add`.
+
+        Dipanggil di akhir siklus, juga saat siklus gagal, agar token tidak hilang dari polling.
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            in_flight = list(self._in_flight.items())
+            for token_address, chain_id in in_flight:
+                self._push(token_address, chain_id, now)
+        return len(in_flight)
+
+    def reschedule(self, token_address, chain_id, rows, now=None):
+        """Menjadwalkan ulang token dari snapshot pair-nya (hasil `parse_token_details`)."""
+        now = time.time() if now is None else now
+        if rows:
+            liquidity = max(row["liquidityUsd"] for row in rows)
+            volume24h = sum(row["volume24h"] for row in rows)
+            # Harga acuan diambil dari pair dengan liquidity terbesar
+            price = max(rows, key=lambda row: row["liquidityUsd"])["priceUsd"]
+            last_price = self._last_price.get(token_address)
+            price_move = abs(price - last_price) / last_price * 100 if last_price else 0.0
+            tier = classify_activity(liquidity, volume24h, price_move)
+        else:
+            price = None
+            tier = "dormant"
+
+        with self._lock:
+            if price:
+                self._last_price[token_address] = price
+            self._tiers[token_address] = tier
+            self._push(token_address, chain_id, now + POLL_INTERVALS[tier])
+        return tier
+
+    def tier_counts(self):
+        counts = dict.fromkeys(POLL_INTERVALS, 0)
+        with self._lock:
+            for tier in self._tiers.values():
+                counts[tier] += 1
+        return counts
+
+
+poll_scheduler = PollScheduler()
@@ -0,0 +1,96 @@
+import os
+import glob
+import gzip
+import json
+import time
+import zlib
+import threading
+from datetime import datetime
+from dotenv import load_dotenv
+
+load_dotenv()
+
+DEX_RECORD_PATH = os.getenv("DEX_RECORD_PATH", "")  # Direktori segmen rekaman, mis. recordings/dex; kosong = tidak merekam
+DEX_RECORD_SEGMENT_CYCLES = int(os.getenv("DEX_RECORD_SEGMENT_CYCLES") or 60)  # Siklus per file segmen
+
+
+class ResponseRecorder:
+    """Menyimpan setiap response API Dexscreener ke segmen JSON Lines ter-gzip untuk replay offline.
+
+    Satu baris per response: `t` (epoch detik), `kind` ("profiles" atau "details"), `url`,
+    `status` dan `body` (teks response apa adanya, tanpa decode ulang).
+
+    Setiap proses menulis ke file sendiri (`dex-<waktu>-<pid>.jsonl.gz`) yang diganti setiap
+    `segment_cycles` siklus, sehingga proses yang dihentikan paksa hanya memotong segmen terakhirnya
+    dan tidak merusak rekaman berikutnya.
+    """
+
+    def __init__(self, directory, segment_cycles=DEX_RECORD_SEGMENT_CYCLES):
+        self.directory = directory
+        self.segment_cycles = segment_cycles
+        self.recorded = 0
+        self._file = None
+        self._cycles = 0
+        self._segments = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _open_segment(self):
+        self._segments += 1
+        name = f"dex-{datetime.now().strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{self._segments:04d}.jsonl.gz"
+        self._file = gzip.open(os.path.join(self.directory, name), "wt", encoding="utf-8")
+        self._cycles = 0
+
+    def _close_segment(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def record(self, kind, response):
+        line = json.dumps({
+            "t": time.time(), "kind": kind, "url": response.url,
+            "status": response.status_code, "body": response.text,
+        })
+        with self._lock:
+            if self._file is None:
+                self._open_segment()
+            self._file.write(line + "\n")
+            self.recorded += 1
+
+    def end_cycle(self):
+        """Menulis isi buffer ke disk; segmen ditutup setelah `segment_cycles` siklus."""
+        with self._lock:
+            if self._file is None:
+                return
+            self._cycles += 1
+            if self._cycles >= self.segment_cycles:
+                self._close_segment()
+            else:
+                self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._close_segment()
+
+
+def recording_segments(path):
+    """File segmen dari `path` (direktori, pola glob atau satu file), urut sesuai waktu tulis."""
+    if os.path.isdir(path):
+        return sorted(glob.glob(os.path.join(path, "*.jsonl.gz")))
+    return sorted(glob.glob(path))
+
+
+def read_recording(path):
+    """Membaca kembali record dari semua segmen rekaman sesuai urutan tulis."""
+    for segment in recording_segments(path):
+        with gzip.open(segment, "rt", encoding="utf-8") as f:
+            try:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+            except (EOFError, zlib.error, gzip.BadGzipFile, json.JSONDecodeError) as e:
+                # Proses perekam berhenti mendadak: sisa segmen ini dilewati, segmen berikutnya tetap terbaca
+                print(f"Truncated recording segment {segment}: {e}")
+
+
+response_recorder = ResponseRecorder(DEX_RECORD_PATH) if DEX_RECORD_PATH else None
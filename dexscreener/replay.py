@@ -0,0 +1,115 @@
+"""Replay rekaman response Dexscreener (lihat DEX_RECORD_PATH) lewat parse, penyimpanan dan analyze_market.
+
+Berjalan secepat mungkin terhadap SQLite, lalu melaporkan siklus/detik dan alert yang akan dikirim
+oleh setiap set threshold. Tidak ada pesan Telegram yang dikirim.
+
+    python -m dexscreener.replay recordings/dex --thresholds thresholds.json
+
+File threshold berisi {"nama": {"pump_price_change": 150, ...}}; key yang tidak diisi memakai DEFAULT_THRESHOLDS.
+"""
+import os
+import io
+import sys
+import json
+import time
+import argparse
+import contextlib
+from datetime import datetime
+
+# Replay tidak boleh menyentuh database produksi: default ke SQLite in-memory sebelum utils.db di-import
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from utils.db import engine
+from utils.json_codec import loads
+from dexscreener.recorder import read_recording
+from dexscreener.dex_watching import (
+    DEX_API_URL, save_tokens, split_token_details, parse_pair_snapshot, analyze_market
+)
+from dexscreener.main import ingest_snapshots
+from dexscreener.alert_state import AlertStateStore
+from dexscreener.detection import DEFAULT_THRESHOLDS
+
+
+def read_cycles(path):
+    """Mengelompokkan rekaman per siklus: setiap response profiles membuka siklus baru."""
+    cycle = None
+    for record in read_recording(path):
+        if record["kind"] == "profiles":
+            if cycle is not None:
+                yield cycle
+            cycle = {"t": record["t"], "profiles": record, "details": []}
+        elif cycle is not None:
+            cycle["details"].append(record)
+            cycle["t"] = record["t"]
+    if cycle is not None:
+        yield cycle
+
+
+def replay_cycle(cycle, threshold_sets, states, alerts):
+    """Memproses satu siklus seperti watch_dexscreener, dengan waktu siklus dari rekaman."""
+    cycle_time = datetime.fromtimestamp(cycle["t"])
+    profiles = cycle["profiles"]
+    if profiles["status"] == 200:
+        save_tokens(loads(profiles["body"]))
+
+    detail_rows = []
+    for record in cycle["details"]:
+        if record["status"] != 200:
+            continue
+        addresses = record["url"][len(DEX_API_URL):].split(",")
+        for token_details in split_token_details(addresses, loads(record["body"])).values():
+            for pair in token_details["pairs"]:
+                snapshot = parse_pair_snapshot(pair, cycle_time)
+                if snapshot:
+                    detail_rows.append(snapshot)
+    ingest_snapshots(detail_rows)
+
+    for name, thresholds in threshold_sets.items():
+        def collect(message, disable_web_page_preview=False, kind=None, name=name):
+            alerts[name][kind] = alerts[name].get(kind, 0) + 1
+        analyze_market(thresholds, now=cycle_time, state=states[name], send=collect)
+    return len(detail_rows)
+
+
+def replay(path, threshold_sets, quiet=True):
+    states = {name: AlertStateStore(persist=False) for name in threshold_sets}
+    alerts = {name: {} for name in threshold_sets}
+    cycles = snapshots = 0
+    first_t = last_t = None
+
+    started = time.perf_counter()
+    for cycle in read_cycles(path):
+        output = io.StringIO() if quiet else sys.stdout
+        with contextlib.redirect_stdout(output):
+            snapshots += replay_cycle(cycle, threshold_sets, states, alerts)
+        cycles += 1
+        first_t = first_t or cycle["t"]
+        last_t = cycle["t"]
+    elapsed = time.perf_counter() - started
+
+    print(f"Replayed {cycles} cycles, {snapshots} snapshots in {elapsed:.2f}s "
+          f"({cycles / max(elapsed, 1e-9):.1f} cycles/s)")
+    if cycles > 1:
+        print(f"Recorded span {last_t - first_t:.0f}s, speedup {(last_t - first_t) / max(elapsed, 1e-9):.0f}x")
+    for name, counts in alerts.items():
+        print(f"  {name}: {sum(counts.values())} alerts {counts}")
+    return {"cycles": cycles, "snapshots": snapshots, "seconds": elapsed, "alerts": alerts}
+
+
+def load_threshold_sets(path):
+    if not path:
+        return {"default": dict(DEFAULT_THRESHOLDS)}
+    with open(path, encoding="utf-8") as f:
+        overrides = json.load(f)
+    return {name: {**DEFAULT_THRESHOLDS, **values} for name, values in overrides.items()}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("recording", help="direktori segmen rekaman, pola glob atau satu file .jsonl.gz")
+    parser.add_argument("--thresholds", help="file JSON berisi set threshold yang dibandingkan")
+    parser.add_argument("--verbose", action="store_true", help="tampilkan log pipeline per siklus")
+    args = parser.parse_args()
+    if engine.dialect.name != "sqlite":
+        raise SystemExit(f"Replay hanya berjalan di SQLite, DATABASE_URL menunjuk ke {engine.dialect.name}")
+    replay(args.recording, load_threshold_sets(args.thresholds), quiet=not args.verbose)
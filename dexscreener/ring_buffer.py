@@ -0,0 +1,151 @@
+import os
+import threading
+import numpy as np
+import pandas as pd
+from datetime import datetime, timedelta
+from dotenv import load_dotenv
+from sqlalchemy import text
+from utils.db import session
+from dexscreener.snapshot import dedupe_snapshots
+
+load_dotenv()
+
+RING_BUFFER_DEPTH = int(os.getenv("RING_BUFFER_DEPTH", 32))  # Snapshot yang disimpan per pair
+RING_BUFFER_REBUILD = os.getenv("RING_BUFFER_REBUILD", "1") == "1"  # Isi ulang dari database saat start
+ANALYSIS_SOURCE = os.getenv("ANALYSIS_SOURCE", "memory")  # "memory" (ring buffer) atau "db" (query dex_token_details)
+
+BUFFER_METRICS = ("priceUsd", "liquidityUsd", "volume24h", "priceChange24h", "market_cap")
+BUFFER_META = ("chain_id", "dex_id", "url", "token_address", "name", "symbol")
+
+
+class SnapshotRingBuffer:
+    """Riwayat snapshot terbaru per pair dalam array NumPy kolumnar (satu array per metrik).
+
+    Setiap pair mendapat satu baris berisi `depth` slot yang ditimpa melingkar, sehingga memori
+    dibatasi jumlah pair x depth. Metadata (nama, url, dst.) hanya disimpan versi terbarunya.
+    """
+
+    def __init__(self, depth=RING_BUFFER_DEPTH, capacity=1024):
+        self.depth = depth
+        self.loaded = False
+        self._index = {}  # pair_address -> baris
+        self._pairs = []  # baris -> pair_address (None jika baris kosong)
+        self._free = []  # baris bekas pair yang dihapus
+        self._meta = {field: [] for field in BUFFER_META}
+        self._capacity = 0
+        self._values = {metric: np.empty((0, depth)) for metric in BUFFER_METRICS}
+        self._times = np.empty((0, depth), dtype="datetime64[us]")
+        self._count = np.empty(0, dtype=np.int64)  # Total snapshot yang pernah ditulis per baris
+        self._lock = threading.Lock()
+        self._grow(capacity)
+
+    def __len__(self):
+        return len(self._index)
+
+    def _grow(self, capacity):
+        extra = capacity - self._capacity
+        for metric in BUFFER_METRICS:
+            self._values[metric] = np.vstack([self._values[metric], np.full((extra, self.depth), np.nan)])
+        self._times = np.vstack([self._times, np.full((extra, self.depth), np.datetime64("NaT"), dtype="datetime64[us]")])
+        self._count = np.concatenate([self._count, np.zeros(extra, dtype=np.int64)])
+        self._capacity = capacity
+
+    def _row_for(self, pair_address):
+        row = self._index.get(pair_address)
+        if row is not None:
+            return row
+        if self._free:
+            row = self._free.pop()
+            self._pairs[row] = pair_address
+        else:
+            row = len(self._pairs)
+            if row >= self._capacity:
+                self._grow(self._capacity * 2)
+            self._pairs.append(pair_address)
+            for field in BUFFER_META:
+                self._meta[field].append(None)
+        self._index[pair_address] = row
+        return row
+
+    def _clear_row(self, row):
+        for metric in BUFFER_METRICS:
+            self._values[metric][row] = np.nan
+        self._times[row] = np.datetime64("NaT")
+        self._count[row] = 0
+
+    def append(self, snapshots):
+        """Menambahkan snapshot (PairSnapshot atau dict) ke riwayat pair masing-masing, satu slot per pair."""
+        if not snapshots:
+            return
+        snapshots = dedupe_snapshots(snapshots)
+        with self._lock:
+            rows, slots = [], []
+            for snapshot in snapshots:
+                row = self._row_for(snapshot["pair_address"])
+                rows.append(row)
+                slots.append(self._count[row] % self.depth)
+                self._count[row] += 1
+                for field in BUFFER_META:
+                    self._meta[field][row] = snapshot[field]
+
+            rows, slots = np.asarray(rows), np.asarray(slots)
+            for metric in BUFFER_METRICS:
+                self._values[metric][rows, slots] = [snapshot[metric] for snapshot in snapshots]
+            self._times[rows, slots] = [np.datetime64(snapshot["created_at"], "us") for snapshot in snapshots]
+
+    def remove_tokens(self, token_addresses):
+        """Menghapus semua pair milik token tertentu (mis. token yang di-retire). Mengembalikan alamat pair yang dihapus."""
+        token_addresses = set(token_addresses)
+        removed = []
+        with self._lock:
+            for row, token_address in enumerate(self._meta["token_address"]):
+                pair_address = self._pairs[row]
+                if pair_address is not None and token_address in token_addresses:
+                    del self._index[pair_address]
+                    self._pairs[row] = None
+                    self._clear_row(row)
+                    self._free.append(row)
+                    removed.append(pair_address)
+        return removed
+
+    def to_frame(self, since=None):
+        """Semua snapshot yang tersimpan (sejak `since`) sebagai DataFrame dengan kolom seperti dex_token_details."""
+        with self._lock:
+            used = len(self._pairs)
+            times = self._times[:used]
+            valid = ~np.isnat(times)
+            if since is not None:
+                valid &= times >= np.datetime64(since, "us")
+            rows, slots = np.nonzero(valid)
+
+            frame = {
+                "pair_address": np.asarray(self._pairs, dtype=object)[rows],
+            }
+            for field in BUFFER_META:
+                frame[field] = np.asarray(self._meta[field], dtype=object)[rows]
+            for metric in BUFFER_METRICS:
+                frame[metric] = self._values[metric][rows, slots]
+            frame["created_at"] = times[rows, slots]
+        return pd.DataFrame(frame)
+
+    def rebuild_from_db(self, window_minutes, chunksize=50000):
+        """Mengisi buffer dari dex_token_details dalam window terakhir, berurutan dari yang terlama."""
+        since = datetime.now() - timedelta(minutes=window_minutes)
+        loaded = 0
+        try:
+            chunks = pd.read_sql_query(
+                text("SELECT * FROM dex_token_details WHERE created_at >= :since ORDER BY created_at"),
+                session.bind, params={"since": since}, chunksize=chunksize
+            )
+            for chunk in chunks:
+                self.append(chunk.to_dict("records"))
+                loaded += len(chunk)
+        except Exception as e:
+            print(f"Rebuild Ring Buffer Error: {e}")
+        finally:
+            session.close()
+        self.loaded = True
+        print(f"Ring buffer rebuilt: {loaded} snapshots, {len(self)} pairs")
+
+
+snapshot_buffer = SnapshotRingBuffer()
@@ -0,0 +1,74 @@
+SNAPSHOT_FIELDS = (
+    "chain_id", "dex_id", "url", "pair_address", "token_address", "name", "symbol",
+    "priceUsd", "liquidityUsd", "volume24h", "priceChange24h", "market_cap", "created_at",
+)
+
+
+class PairSnapshot:
+    """Snapshot satu pair dengan `__slots__`, kolomnya sama dengan tabel dex_token_details.
+
+    Jauh lebih hemat memori daripada dict per pair. `snapshot["volume24h"]` tetap didukung
+    agar kode yang memperlakukan baris sebagai dict tidak perlu diubah.
+    """
+
+    __slots__ = SNAPSHOT_FIELDS
+
+    def __init__(self, chain_id, dex_id, url, pair_address, token_address, name, symbol,
+                 priceUsd, liquidityUsd, volume24h, priceChange24h, market_cap, created_at):
+        self.chain_id = chain_id
+        self.dex_id = dex_id
+        self.url = url
+        self.pair_address = pair_address
+        self.token_address = token_address
+        self.name = name
+        self.symbol = symbol
+        self.priceUsd = priceUsd
+        self.liquidityUsd = liquidityUsd
+        self.volume24h = volume24h
+        self.priceChange24h = priceChange24h
+        self.market_cap = market_cap
+        self.created_at = created_at
+
+    @classmethod
+    def from_pair(cls, pair, created_at):
+        """Mengisi snapshot langsung dari pair hasil decode JSON Dexscreener."""
+        base = pair.get("baseToken") or {}
+        return cls(
+            pair.get("chainId", ""),
+            pair.get("dexId", ""),
+            pair.get("url", ""),
+            pair.get("pairAddress", ""),
+            base.get("address", "-"),
+            base.get("name", "-"),
+            base.get("symbol", "-"),
+            float(pair.get("priceUsd") or 0),
+            float((pair.get("liquidity") or {}).get("usd") or 0),
+            float((pair.get("volume") or {}).get("h24") or 0),
+            float((pair.get("priceChange") or {}).get("h24") or 0),
+            float(pair.get("marketCap") or 0),
+            created_at,
+        )
+
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+
+    def as_dict(self):
+        return {field: getattr(self, field) for field in SNAPSHOT_FIELDS}
+
+    def __repr__(self):
+        return f"PairSnapshot({self.pair_address!r}, priceUsd={self.priceUsd}, created_at={self.created_at})"
+
+
+def dedupe_snapshots(snapshots):
+    """Satu snapshot per pair_address (yang terakhir menang), urutan kemunculan pertama dipertahankan.
+
+    Pair yang cocok dengan base dan quote token sekaligus ikut di detail kedua token, sehingga
+    tanpa ini pair tersebut tercatat dua kali dalam satu siklus.
+    """
+    by_pair = {}
+    for snapshot in snapshots:
+        by_pair[snapshot["pair_address"]] = snapshot
+    return list(by_pair.values()) if len(by_pair) < len(snapshots) else snapshots
@@ -0,0 +1,64 @@
+import threading
+from utils.db import session
+from dexscreener.models import Token
+
+
+class KnownTokenIndex:
+    """Indeks in-memory token yang sudah tersimpan di dex_tokens (token_address -> chain_id).
+
+    Diisi sekali dari database lalu diperbarui setiap kali insert token baru berhasil,
+    sehingga ingest profil dan loop detail tidak perlu membaca ulang tabel tiap siklus.
+    Token berstatus dormant saat indeks dimuat dicatat terpisah agar scheduler bisa
+    langsung menempatkannya di tier dormant.
+    """
+
+    def __init__(self):
+        self._tokens = {}
+        self._dormant = set()
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def load(self):
+        """Mengisi ulang indeks dari tabel dex_tokens."""
+        try:
+            rows = session.query(Token.token_address, Token.chain_id, Token.status).all()
+        finally:
+            session.close()
+        with self._lock:
+            self._tokens = {address: chain_id for address, chain_id, _ in rows}
+            self._dormant = {address for address, _, status in rows if status == "dormant"}
+            self._loaded = True
+        print(f"Known token index loaded: {len(rows)} tokens, {len(self._dormant)} dormant")
+
+    def ensure_loaded(self):
+        if not self._loaded:
+            self.load()
+
+    def __contains__(self, token_address):
+        return token_address in self._tokens
+
+    def __len__(self):
+        return len(self._tokens)
+
+    def add(self, token_address, chain_id):
+        with self._lock:
+            self._tokens[token_address] = chain_id
+            self._dormant.discard(token_address)
+
+    def discard(self, token_address):
+        with self._lock:
+            self._tokens.pop(token_address, None)
+            self._dormant.discard(token_address)
+
+    def dormant(self):
+        """Alamat token yang berstatus dormant saat indeks terakhir dimuat."""
+        with self._lock:
+            return set(self._dormant)
+
+    def items(self):
+        """Snapshot (token_address, chain_id) untuk diiterasi tanpa terganggu perubahan indeks."""
+        with self._lock:
+            return list(self._tokens.items())
+
+
+known_tokens = KnownTokenIndex()
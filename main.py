@@ -1,16 +1,36 @@
+import os
+from dotenv import load_dotenv
 from dexscreener.main import watch_dexscreener
-from binance.main import watch_binance
-import time
+from binance.main import watch_binance, BNC_MODE
+from dexscreener.lifecycle import run_lifecycle, TOKEN_LIFECYCLE_INTERVAL
+from dexscreener.history_archive import run_archive, ARCHIVE_ENABLED, ARCHIVE_INTERVAL
+from utils.scheduler import Scheduler
+from utils.metrics import start_metrics_server
+from utils.profiler import cycle_profiler
+from dexscreener.recorder import response_recorder
+
+load_dotenv()
+
+DEX_INTERVAL = int(os.getenv("DEX_INTERVAL", 60))  # Detik
+BNC_INTERVAL = int(os.getenv("BNC_INTERVAL", 60))  # Detik, untuk BNC_MODE=rest
+JOB_OVERRUN = os.getenv("JOB_OVERRUN", "skip")  # "skip" atau "queue"
 
 if __name__ == "__main__":
-    i = 1
-    while True:
-        try:
-            # watch_binance()
-            watch_dexscreener()
-        except Exception as e:
-            print(f"Main Loop Error: {e}")
-        
-        print(i)
-        i += 1
-        time.sleep(60)
\ No newline at end of file
+    start_metrics_server()
+    cycle_profiler.install_signal()
+    scheduler = Scheduler()
+    scheduler.add_job("dexscreener", cycle_profiler.wrap("dexscreener", watch_dexscreener), DEX_INTERVAL, JOB_OVERRUN)
+    scheduler.add_job("token-lifecycle", run_lifecycle, TOKEN_LIFECYCLE_INTERVAL, "skip",
+                      start_delay=TOKEN_LIFECYCLE_INTERVAL)
+    if ARCHIVE_ENABLED:
+        scheduler.add_job("history-archive", run_archive, ARCHIVE_INTERVAL, "skip")
+
+    if BNC_MODE == "rest":
+        scheduler.add_job("binance", cycle_profiler.wrap("binance", watch_binance), BNC_INTERVAL, JOB_OVERRUN)
+    elif BNC_MODE == "stream":
+        from binance.stream import start_binance_stream
+        start_binance_stream()
+
+    scheduler.run_forever()
+    if response_recorder:
+        response_recorder.close()
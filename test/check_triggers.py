@@ -0,0 +1,36 @@
+"""Cek aturan penembusan TriggerEngine: menyentuh level lalu mundur harus bergantian up/down.
+
+    PYTHONPATH=. python test/check_triggers.py
+"""
+from binance.triggers import PriceLevel, TriggerEngine
+
+
+def fired(engine, symbol, prices):
+    return [[(level.label, direction) for level, direction in engine.update(symbol, price)] for price in prices]
+
+
+def check_touch_and_retreat():
+    engine = TriggerEngine()
+    engine.load([("ABCUSDT", PriceLevel(7.0, "both", "level"))])
+    result = fired(engine, "ABCUSDT", [6.9, 7.0, 6.9, 7.0, 7.1, 7.0, 6.9])
+    expected = [[], [("level", "up")], [("level", "down")], [("level", "up")], [], [], [("level", "down")]]
+    assert result == expected, result
+
+
+def check_multiple_levels():
+    engine = TriggerEngine()
+    engine.load([("ABCUSDT", PriceLevel(price, "both", str(price))) for price in (5.0, 6.0, 7.0)])
+    result = fired(engine, "ABCUSDT", [4.0, 7.0, 5.0, 4.9])
+    expected = [
+        [],
+        [("5.0", "up"), ("6.0", "up"), ("7.0", "up")],
+        [("7.0", "down"), ("6.0", "down")],
+        [("5.0", "down")],
+    ]
+    assert result == expected, result
+
+
+if __name__ == "__main__":
+    check_touch_and_retreat()
+    check_multiple_levels()
+    print("TriggerEngine checks passed")
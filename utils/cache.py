@@ -0,0 +1,103 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """Cache dengan TTL per key, eviksi LRU yang dibatasi total ukuran (byte perkiraan), dan single-flight.
+
+    `get_many` hanya memanggil loader untuk key yang belum ada di cache dan belum sedang diambil
+    thread lain; pemanggil lain untuk key yang sama menunggu hasil request yang sedang berjalan.
+    """
+
+    def __init__(self, ttl, max_bytes):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._data = OrderedDict()  # key -> (expires_at, size, value)
+        self._inflight = {}  # key -> threading.Event
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def _get_locked(self, key, now):
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= now:
+            del self._data[key]
+            self.bytes -= entry[1]
+            return None
+        self._data.move_to_end(key)
+        return entry
+
+    def set(self, key, value, size):
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self.bytes -= old[1]
+            if size > self.max_bytes:
+                return
+            self._data[key] = (time.monotonic() + self.ttl, size, value)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                _, (_, evicted_size, _) = self._data.popitem(last=False)
+                self.bytes -= evicted_size
+                self.evictions += 1
+
+    def get_many(self, keys, loader, sizeof):
+        """Mengambil banyak key sekaligus; `loader(keys)` mengembalikan dict key -> value untuk key yang hilang.
+
+        Key yang gagal dimuat (tidak ada di hasil loader) tidak ikut dikembalikan.
+        """
+        results, owned, waiting = {}, [], {}
+        now = time.monotonic()
+        with self._lock:
+            for key in keys:
+                entry = self._get_locked(key, now)
+                if entry is not None:
+                    self.hits += 1
+                    results[key] = entry[2]
+                elif key in self._inflight:
+                    self.coalesced += 1
+                    waiting[key] = self._inflight[key]
+                else:
+                    self.misses += 1
+                    self._inflight[key] = threading.Event()
+                    owned.append(key)
+
+        if owned:
+            try:
+                loaded = loader(owned) or {}
+                for key, value in loaded.items():
+                    self.set(key, value, sizeof(value))
+                    results[key] = value
+            finally:
+                with self._lock:
+                    for key in owned:
+                        self._inflight.pop(key).set()
+
+        for key, event in waiting.items():
+            event.wait()
+            with self._lock:
+                entry = self._get_locked(key, time.monotonic())
+            if entry is not None:
+                results[key] = entry[2]
+        return results
+
+    def stats(self):
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "entries": len(self._data),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "hit_ratio": round((self.hits + self.coalesced) / lookups, 3) if lookups else 0.0,
+        }
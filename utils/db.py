@@ -1,6 +1,8 @@
 import os
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.dialects import mysql, postgresql, sqlite
 from sqlalchemy.orm import sessionmaker, scoped_session
+from sqlalchemy.pool import StaticPool
 from sqlalchemy.ext.declarative import declarative_base
 from dotenv import load_dotenv
 
@@ -14,12 +16,105 @@ DB_USER = os.getenv("DB_USER")
 DB_PASSWD = os.getenv("DB_PASSWD")
 DB_NAME = os.getenv("DB_NAME")
 
-DATABASE_URI = f"mysql+pymysql://{DB_USER}:{DB_PASSWD}@{DB_HOST}/{DB_NAME}"
+# Backend: "mysql" (default) atau "sqlite" untuk node tanpa server MySQL
+DB_BACKEND = os.getenv("DB_BACKEND", "mysql")
+SQLITE_PATH = os.getenv("SQLITE_PATH", "dexscreener_data.db")
+SQLITE_MMAP_MB = int(os.getenv("SQLITE_MMAP_MB", 256))
+SQLITE_CACHE_MB = int(os.getenv("SQLITE_CACHE_MB", 64))
+SQLITE_BUSY_TIMEOUT = float(os.getenv("SQLITE_BUSY_TIMEOUT", 30))  # Detik menunggu lock writer lain
+
+# DATABASE_URL (mis. sqlite:///replay.db) menggantikan keduanya, dipakai untuk replay dan benchmark offline
+DATABASE_URL = os.getenv("DATABASE_URL")
+if DATABASE_URL:
+    DATABASE_URI = DATABASE_URL
+elif DB_BACKEND == "sqlite":
+    DATABASE_URI = f"sqlite:///{SQLITE_PATH}"
+else:
+    DATABASE_URI = f"mysql+pymysql://{DB_USER}:{DB_PASSWD}@{DB_HOST}/{DB_NAME}"
+
+
+def _create_sqlite_engine(uri):
+    """Engine SQLite untuk satu node dengan banyak tulis: WAL, synchronous=NORMAL, mmap dan cache besar."""
+    connect_args = {"check_same_thread": False, "timeout": SQLITE_BUSY_TIMEOUT}
+    in_memory = uri in ("sqlite://", "sqlite:///:memory:")
+    if in_memory:
+        # Satu koneksi bersama supaya database in-memory terlihat dari semua thread
+        sqlite_engine = create_engine(uri, echo=False, poolclass=StaticPool, connect_args=connect_args)
+    else:
+        sqlite_engine = create_engine(uri, echo=False, pool_size=5, max_overflow=5, connect_args=connect_args)
+
+    @event.listens_for(sqlite_engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        if not in_memory:
+            # Pembaca tidak memblokir penulis; fsync hanya saat checkpoint, commit tetap atomik
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_MB * 1024 * 1024}")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_MB * 1024}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
+
+    return sqlite_engine
+
 
 # Create engine and session
-engine = create_engine(DATABASE_URI, echo=False, pool_size=10, max_overflow=20)
+if DATABASE_URI.startswith("sqlite"):
+    engine = _create_sqlite_engine(DATABASE_URI)
+else:
+    engine = create_engine(DATABASE_URI, echo=False, pool_size=10, max_overflow=20)
+
+# Baris per transaksi untuk bulk insert; SQLite hanya punya satu writer, jadi transaksi besar lebih murah
+DB_WRITE_BATCH = int(os.getenv("DB_WRITE_BATCH") or (20000 if engine.dialect.name == "sqlite" else 1000))
+
 Session = scoped_session(sessionmaker(bind=engine))
-session = Session()
+# Proxy ke session milik thread yang memanggil, aman dipakai job yang berjalan paralel
+session = Session
 
 # Base model for ORM
 Base = declarative_base()
+
+
+def insert_ignore(table):
+    """Statement INSERT yang melewati baris dengan unique key yang sudah ada, sesuai dialek database."""
+    dialect = engine.dialect.name
+    if dialect == "mysql":
+        return mysql.insert(table).prefix_with("IGNORE")
+    if dialect == "postgresql":
+        return postgresql.insert(table).on_conflict_do_nothing()
+    if dialect == "sqlite":
+        return sqlite.insert(table).on_conflict_do_nothing()
+    raise NotImplementedError(f"insert_ignore tidak mendukung dialek {dialect}")
+
+
+def insert_ignore_returning(db, table, rows, column):
+    """Menjalankan `insert_ignore` untuk `rows` dan mengembalikan nilai `column` dari baris yang benar-benar dimasukkan.
+
+    Hasilnya berasal dari insert itu sendiri, jadi tetap benar saat beberapa proses menulis bersamaan.
+    SQLite dan PostgreSQL memakai RETURNING; MySQL tidak mendukungnya, sehingga baris dimasukkan
+    satu per satu dan rowcount 1 menandai baris baru.
+    """
+    if not rows:
+        return []
+    if engine.dialect.name == "mysql":
+        statement = insert_ignore(table)
+        return [row[column] for row in rows if db.execute(statement, row).rowcount]
+    result = db.execute(insert_ignore(table).returning(table.c[column]), rows)
+    return [row[0] for row in result]
+
+
+def add_missing_columns(table, column_names):
+    """Menambahkan kolom `column_names` yang belum ada di tabel lama, karena create_all tidak mengubah tabel yang sudah ada.
+
+    Hanya kolom yang disebut eksplisit yang ditambahkan (nullable, tanpa default di database);
+    perubahan skema lain tidak ditangani di sini.
+    """
+    existing = {column["name"] for column in inspect(engine).get_columns(table.name)}
+    missing = [table.columns[name] for name in column_names if name not in existing]
+    if not missing:
+        return
+    with engine.begin() as conn:
+        for column in missing:
+            column_type = column.type.compile(dialect=engine.dialect)
+            conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+            print(f"Added column {table.name}.{column.name}")
@@ -0,0 +1,63 @@
+import os
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib.parse import urlsplit
+from dotenv import load_dotenv
+from utils.metrics import http_responses
+
+load_dotenv()
+
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", 10))  # Detik, untuk connect maupun read
+HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", 3))
+HTTP_BACKOFF = float(os.getenv("HTTP_BACKOFF", 0.5))  # Jeda retry: 0.5s, 1s, 2s, ...
+HTTP_POOL_HOSTS = int(os.getenv("HTTP_POOL_HOSTS", 10))  # Jumlah host yang pool-nya disimpan
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", 16))  # Koneksi keep-alive per host
+
+RETRY_STATUS = (429, 500, 502, 503, 504)
+
+
+def build_session(retries=HTTP_RETRIES):
+    """Membuat requests.Session dengan connection pool per host, keep-alive dan retry/backoff.
+
+    Retry berlaku untuk error koneksi dan status 429/5xx; header `Retry-After` dihormati.
+    Setelah retry habis, response terakhir tetap dikembalikan (tidak raise).
+    """
+    retry = Retry(
+        total=retries,
+        backoff_factor=HTTP_BACKOFF,
+        status_forcelist=RETRY_STATUS,
+        allowed_methods=frozenset({"GET", "POST"}),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=HTTP_POOL_HOSTS, pool_maxsize=HTTP_POOL_SIZE, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+# Session bersama untuk semua request keluar (Dexscreener, Binance, Telegram)
+http_session = build_session()
+
+
+def count_response(url, response):
+    """Mencatat status response (atau `error` jika None) ke metrik per host."""
+    host = urlsplit(url).hostname
+    http_responses.inc(host=host, status=response.status_code if response is not None else "error")
+
+
+def _request(method, url, timeout, kwargs):
+    try:
+        response = method(url, timeout=timeout, **kwargs)
+    except Exception:
+        count_response(url, None)
+        raise
+    count_response(url, response)
+    return response
+
+
+def http_get(url, timeout=HTTP_TIMEOUT, **kwargs):
+    """GET lewat session bersama."""
+    return _request(http_session.get, url, timeout, kwargs)
@@ -0,0 +1,18 @@
+import json
+
+try:
+    import orjson
+except ImportError:  # orjson opsional, fallback ke json bawaan
+    orjson = None
+
+
+def loads(data):
+    """Decode JSON dari bytes/str, memakai orjson jika terpasang."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def response_json(response):
+    """Pengganti `response.json()` yang memakai decoder tercepat yang tersedia."""
+    return loads(response.content)
@@ -0,0 +1,111 @@
+import os
+import io
+import time
+import signal
+import pstats
+import cProfile
+import threading
+from datetime import datetime
+from dotenv import load_dotenv
+
+load_dotenv()
+
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+PROFILE_CYCLES = int(os.getenv("PROFILE_CYCLES", 3))  # Jumlah run per job yang diprofil setiap kali dipicu
+PROFILE_AT_START = int(os.getenv("PROFILE_AT_START", 0))  # > 0: profil N run pertama setiap job
+PROFILE_TRIGGER_FILE = os.getenv("PROFILE_TRIGGER_FILE", "profile.trigger")  # Isi opsional: jumlah run
+PROFILE_TOP = int(os.getenv("PROFILE_TOP", 30))  # Jumlah fungsi di ringkasan teks
+
+
+class CycleProfiler:
+    """Memprofil N run berikutnya dari job yang dibungkus `wrap`, lalu menulis .prof dan ringkasan .txt.
+
+    Dipicu lewat SIGUSR1, file trigger (dihapus setelah dibaca) atau PROFILE_AT_START. Selama tidak
+    dipicu, wrapper hanya memanggil fungsi aslinya setelah satu cek keberadaan file per run.
+    """
+
+    def __init__(self, output_dir=PROFILE_DIR, cycles=PROFILE_CYCLES, trigger_file=PROFILE_TRIGGER_FILE,
+                 top=PROFILE_TOP):
+        self.output_dir = output_dir
+        self.cycles = cycles
+        self.trigger_file = trigger_file
+        self.top = top
+        self._remaining = {}  # nama job -> run yang masih harus diprofil
+        self._requested = 0  # Diisi signal handler, diterapkan di run berikutnya
+        self._written = 0
+        # cProfile (sys.monitoring di Python 3.12+) hanya boleh aktif satu per proses
+        self._lock = threading.Lock()
+
+    def arm(self, cycles=None):
+        """Memprofil `cycles` run berikutnya dari setiap job yang dibungkus."""
+        cycles = cycles or self.cycles
+        for name in self._remaining:
+            self._remaining[name] = cycles
+        print(f"Profiler armed: next {cycles} runs of {', '.join(self._remaining)}")
+
+    def install_signal(self, signum=getattr(signal, "SIGUSR1", None)):
+        """Memasang handler SIGUSR1 (`kill -USR1 <pid>`); harus dipanggil dari main thread."""
+        if signum is None:  # Windows tidak punya SIGUSR1, pakai file trigger
+            return
+        signal.signal(signum, lambda *_: setattr(self, "_requested", self.cycles))
+
+    def _check_trigger(self):
+        if self._requested:
+            cycles, self._requested = self._requested, 0
+            self.arm(cycles)
+        if self.trigger_file and os.path.exists(self.trigger_file):
+            try:
+                with open(self.trigger_file, encoding="utf-8") as f:
+                    content = f.read().strip()
+                os.remove(self.trigger_file)
+            except OSError:
+                return
+            self.arm(int(content) if content.isdigit() else None)
+
+    def wrap(self, name, func):
+        self._remaining[name] = PROFILE_AT_START
+
+        def run():
+            self._check_trigger()
+            if not self._remaining[name]:
+                return func()
+            return self._profile(name, func)
+
+        run.__name__ = getattr(func, "__name__", name)
+        return run
+
+    def _profile(self, name, func):
+        if not self._lock.acquire(blocking=False):
+            return func()  # Job lain sedang diprofil; run ini tidak dihitung
+        try:
+            self._remaining[name] -= 1
+            profile = cProfile.Profile()
+            started = time.perf_counter()
+            try:
+                return profile.runcall(func)
+            finally:
+                profile.disable()
+                try:
+                    self._write(name, profile, time.perf_counter() - started)
+                except OSError as e:
+                    print(f"Profile Write Error ({name}): {e}")
+        finally:
+            self._lock.release()
+
+    def _write(self, name, profile, elapsed):
+        os.makedirs(self.output_dir, exist_ok=True)
+        self._written += 1
+        base = os.path.join(self.output_dir, f"{name}-{datetime.now().strftime('%Y%m%d-%H%M%S')}-{self._written}")
+        profile.dump_stats(base + ".prof")
+
+        summary = io.StringIO()
+        summary.write(f"{name}: {elapsed:.2f}s\n\n")
+        for sort_key in ("cumulative", "tottime"):
+            summary.write(f"=== top {self.top} by {sort_key} ===\n")
+            pstats.Stats(profile, stream=summary).strip_dirs().sort_stats(sort_key).print_stats(self.top)
+        with open(base + ".txt", "w", encoding="utf-8") as f:
+            f.write(summary.getvalue())
+        print(f"Profile {name} ({elapsed:.2f}s) saved to {base}.prof, {self._remaining[name]} runs left")
+
+
+cycle_profiler = CycleProfiler()
@@ -0,0 +1,100 @@
+import signal
+import threading
+import time
+from utils.metrics import job_duration, job_overruns, job_skipped, job_lag
+
+
+class Job:
+    """Satu pekerjaan periodik dengan interval tetap (fixed-rate) dan statistik lag/overrun."""
+
+    def __init__(self, name, func, interval, overrun="skip", start_delay=0):
+        if overrun not in ("skip", "queue"):
+            raise ValueError(f"overrun harus 'skip' atau 'queue', bukan {overrun!r}")
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.overrun = overrun
+        self.start_delay = start_delay
+        self.runs = 0
+        self.overruns = 0
+        self.skipped = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self.last_duration = 0.0
+
+
+class Scheduler:
+    """Menjalankan setiap job di thread sendiri pada deadline tetap: start, start + interval, ...
+
+    Durasi job tidak menggeser jadwal. Jika job melewati deadline berikutnya (overrun),
+    `skip` melompat ke deadline berikutnya yang masih di depan, sedangkan `queue`
+    langsung menjalankan deadline yang tertinggal satu per satu.
+    """
+
+    def __init__(self):
+        self.jobs = []
+        self._threads = []
+        self._stop = threading.Event()
+
+    def add_job(self, name, func, interval, overrun="skip", start_delay=0):
+        job = Job(name, func, interval, overrun, start_delay)
+        self.jobs.append(job)
+        return job
+
+    def _run_job(self, job):
+        next_run = time.monotonic() + job.start_delay
+        while not self._stop.is_set():
+            wait = next_run - time.monotonic()
+            if wait > 0 and self._stop.wait(wait):
+                break
+
+            started = time.monotonic()
+            job.last_lag = started - next_run
+            job.max_lag = max(job.max_lag, job.last_lag)
+            job_lag.set(round(job.last_lag, 3), job=job.name)
+            try:
+                job.func()
+            except Exception as e:
+                print(f"Job {job.name} Error: {e}")
+            finished = time.monotonic()
+            job.last_duration = finished - started
+            job.runs += 1
+            job_duration.observe(job.last_duration, job=job.name)
+
+            next_run += job.interval
+            if finished > next_run:
+                job.overruns += 1
+                job_overruns.inc(job=job.name)
+                if job.overrun == "skip":
+                    missed = int((finished - next_run) // job.interval) + 1
+                    job.skipped += missed
+                    job_skipped.inc(missed, job=job.name)
+                    next_run += missed * job.interval
+
+            print(
+                f"[{job.name}] run {job.runs} took {job.last_duration:.2f}s, "
+                f"lag {job.last_lag:.2f}s, overruns {job.overruns}"
+            )
+
+    def start(self):
+        for job in self.jobs:
+            thread = threading.Thread(target=self._run_job, args=(job,), name=f"job-{job.name}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def run_forever(self):
+        """Menjalankan semua job dan memblokir sampai Ctrl+C atau SIGTERM (stop systemd/docker)."""
+        signal.signal(signal.SIGTERM, lambda *_: self._stop.set())
+        self.start()
+        try:
+            while not self._stop.wait(1):
+                pass
+        except KeyboardInterrupt:
+            pass
+        print("Stopping scheduler...")
+        self.stop(timeout=5)
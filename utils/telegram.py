@@ -1,21 +1,204 @@
 import os
-import requests
+import threading
+import time
+from collections import deque
 from dotenv import load_dotenv
+from utils.http_client import build_session, count_response, HTTP_TIMEOUT
+from utils.metrics import stage_seconds, telegram_messages
 
 load_dotenv()
 
 TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
 TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")
 
-def send_telegram_message(message, disable_web_page_preview=False):
-    try:
+TELEGRAM_QUEUE_SIZE = int(os.getenv("TELEGRAM_QUEUE_SIZE", 1000))
+TELEGRAM_GLOBAL_RATE = float(os.getenv("TELEGRAM_GLOBAL_RATE", 30))  # Pesan per detik untuk semua chat
+TELEGRAM_CHAT_RATE = float(os.getenv("TELEGRAM_CHAT_RATE", 20 / 60))  # Pesan per detik per chat (limit grup 20/menit)
+TELEGRAM_CHAT_BURST = int(os.getenv("TELEGRAM_CHAT_BURST", 3))
+TELEGRAM_DIGEST_BACKLOG = int(os.getenv("TELEGRAM_DIGEST_BACKLOG", 5))  # Antrian sepanjang ini -> alert digabung
+TELEGRAM_MAX_RETRIES = 5
+TELEGRAM_MAX_LENGTH = 4096
+DIGEST_SEPARATOR = "\n〰️〰️〰️\n"
+
+# Retry 429 ditangani sendiri oleh sender memakai `retry_after` dari Telegram
+telegram_session = build_session(retries=0)
+
+
+class TokenBucket:
+    """Token bucket sederhana: `rate` token per detik dengan kapasitas burst `capacity`."""
+
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self):
+        """Detik yang perlu ditunggu sampai satu token tersedia."""
+        self._refill()
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def consume(self):
+        self._refill()
+        self.tokens -= 1
+
+
+class TelegramSender:
+    """Mengirim pesan Telegram dari background thread lewat antrian terbatas.
+
+    Pemanggil tidak pernah menunggu Telegram: pesan hanya dimasukkan ke antrian (dibuang jika penuh).
+    Pengiriman dibatasi token bucket global dan per chat, 429 diulang sesuai `retry_after`,
+    dan saat antrian menumpuk beberapa alert dengan `kind` yang sama digabung menjadi satu digest.
+    """
+
+    def __init__(self, maxsize=TELEGRAM_QUEUE_SIZE):
+        self.maxsize = maxsize
+        self._items = deque()  # Pesan yang belum dikirim; panjangnya tidak pernah melebihi maxsize
+        self._ready = threading.Condition()
+        self._global_bucket = TokenBucket(TELEGRAM_GLOBAL_RATE, max(1, int(TELEGRAM_GLOBAL_RATE)))
+        self._chat_buckets = {}
+        self._thread = None
+        self._lock = threading.Lock()
+        self.sent = 0
+        self.dropped = 0
+        self.digested = 0
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="telegram-sender", daemon=True)
+                self._thread.start()
+
+    def send(self, message, disable_web_page_preview=False, kind=None, chat_id=None):
+        """Memasukkan pesan ke antrian. Mengembalikan False jika antrian penuh dan pesan dibuang."""
+        self.start()
+        item = {
+            "chat_id": chat_id or TELEGRAM_CHAT_ID,
+            "text": message,
+            "disable_web_page_preview": disable_web_page_preview,
+            "kind": kind,
+        }
+        with self._ready:
+            if len(self._items) < self.maxsize:
+                self._items.append(item)
+                self._ready.notify()
+                return True
+            self.dropped += 1
+        telegram_messages.inc(result="dropped")
+        print(f"Telegram Error: antrian penuh, pesan dibuang ({self.dropped} total)")
+        return False
+
+    def _next_item(self):
+        with self._ready:
+            while not self._items:
+                self._ready.wait()
+            return self._items.popleft()
+
+    def _merge_backlog(self, item):
+        """Menggabungkan alert sejenis yang mengantri ke dalam `item` jika antrian sedang menumpuk.
+
+        Hanya pesan yang ikut digabung yang dikeluarkan dari antrian; pesan lain tetap di tempatnya
+        dan tetap dihitung terhadap `maxsize`.
+        """
+        key = (item["chat_id"], item["kind"], item["disable_web_page_preview"])
+        texts = [item["text"].strip()]
+        length = len(texts[0])
+        with self._ready:
+            if item["kind"] is None or len(self._items) < TELEGRAM_DIGEST_BACKLOG:
+                return item, 1
+            rest = deque()
+            for other in self._items:
+                other_key = (other["chat_id"], other["kind"], other["disable_web_page_preview"])
+                if other_key == key and length + len(other["text"]) + len(DIGEST_SEPARATOR) + 64 < TELEGRAM_MAX_LENGTH:
+                    texts.append(other["text"].strip())
+                    length += len(texts[-1]) + len(DIGEST_SEPARATOR)
+                else:
+                    rest.append(other)
+            self._items = rest
+
+        if len(texts) == 1:
+            return item, 1
+        self.digested += len(texts)
+        telegram_messages.inc(len(texts), result="digested")
+        header = f"*🧾 Digest: {len(texts)} alert {item['kind']}*\n\n"
+        return dict(item, text=header + DIGEST_SEPARATOR.join(texts)), len(texts)
+
+    def _wait_for_slot(self, chat_id):
+        bucket = self._chat_buckets.get(chat_id)
+        if bucket is None:
+            bucket = self._chat_buckets[chat_id] = TokenBucket(TELEGRAM_CHAT_RATE, TELEGRAM_CHAT_BURST)
+        while True:
+            delay = max(self._global_bucket.delay(), bucket.delay())
+            if delay <= 0:
+                break
+            time.sleep(delay)
+        self._global_bucket.consume()
+        bucket.consume()
+
+    def _post(self, item):
+        """Mengirim satu pesan, mengulang saat 429 atau error jaringan. Mengembalikan True jika terkirim."""
         url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
         payload = {
-            "chat_id": TELEGRAM_CHAT_ID,
-            "text": message,
+            "chat_id": item["chat_id"],
+            "text": item["text"],
             "parse_mode": "Markdown",
-            "disable_web_page_preview": disable_web_page_preview
+            "disable_web_page_preview": item["disable_web_page_preview"],
         }
-        requests.post(url, data=payload)
-    except Exception as e:
-        print(f"Telegram Error: {e}")
+        for attempt in range(1, TELEGRAM_MAX_RETRIES + 1):
+            self._wait_for_slot(item["chat_id"])
+            try:
+                response = telegram_session.post(url, data=payload, timeout=HTTP_TIMEOUT)
+                count_response(url, response)
+            except Exception as e:
+                count_response(url, None)
+                print(f"Telegram Error (attempt {attempt}): {e}")
+                time.sleep(min(2 ** attempt, 30))
+                continue
+
+            if response.status_code == 200:
+                return True
+            if response.status_code == 429:
+                try:
+                    retry_after = response.json().get("parameters", {}).get("retry_after", 1)
+                except ValueError:
+                    retry_after = int(response.headers.get("Retry-After", 1))
+                print(f"Telegram 429: retry after {retry_after}s")
+                time.sleep(retry_after)
+                continue
+            if response.status_code >= 500:
+                time.sleep(min(2 ** attempt, 30))
+                continue
+            print(f"Telegram Error: {response.status_code} {response.text[:200]}")
+            return False
+        return False
+
+    def _run(self):
+        while True:
+            item = self._next_item()
+            item, count = self._merge_backlog(item)
+            try:
+                with stage_seconds.time(stage="notify"):
+                    delivered = self._post(item)
+                if delivered:
+                    self.sent += count
+                    telegram_messages.inc(count, result="sent")
+                else:
+                    self.dropped += count
+                    telegram_messages.inc(count, result="dropped")
+            except Exception as e:
+                self.dropped += count
+                telegram_messages.inc(count, result="dropped")
+                print(f"Telegram Error: {e}")
+
+
+telegram_sender = TelegramSender()
+
+
+def send_telegram_message(message, disable_web_page_preview=False, kind=None):
+    """Mengantrikan pesan Telegram tanpa menunggu pengiriman; `kind` dipakai untuk menggabungkan alert sejenis."""
+    telegram_sender.send(message, disable_web_page_preview, kind)